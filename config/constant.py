@@ -1,20 +1,23 @@
 # Game constants like screen size, player speed, etc.
+# These are the values the game actually plays with: src/simulation.py reads
+# them. Per-level progression (speed, chances, score) is in config/levels.json.
+
 # Window dimensions
 WINDOW_WIDTH = 800
-WINDOW_HEIGHT = 400
+WINDOW_HEIGHT = 600
+GROUND_HEIGHT = 50
 
 # Player settings
-PLAYER_RADIUS = 20
-PLAYER_SPEED = 20
-
-# Ball settings
-BALL_RADIUS = 15
-BALL_SPEED_X = 4
-BALL_SPEED_Y = 2
+PLAYER_HALF_WIDTH = 40
+PLAYER_HEIGHT = 114
+PLAYER_SPEED = 6  # pixels per frame
 
-# Goal line settings
-GOAL_LINE_WIDTH = 5
+# Ball settings (balls fall straight down; their speed comes from levels.json)
+BALL_RADIUS = 10
+BALL_SPAWN_Y = 20
+CATCH_REACH = 10  # how far above the player's head a ball counts as caught
 
 # Colors
-BACKGROUND_COLOR = 'green'
-GOAL_COLOR = 'yellow'
+BACKGROUND_COLOR = 'lightblue'
+GROUND_COLOR = 'green'
+BALL_COLOR = 'red'
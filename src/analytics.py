@@ -0,0 +1,152 @@
+"""
+Analytics - buffered, size-rotated per-drop log
+
+Every ball drop is recorded in memory and written out in batches as a columnar
+block, so the game never writes to disk once per frame or once per drop. A
+batch is also written once it is FLUSH_SECONDS old, so a killed process loses
+at most that much play, and only the newest max_files files are kept.
+
+File layout (little-endian):
+    header  b"BCDL" + uint16 version
+    block   b"BLK0" + uint32 record count, then one packed array per column
+            in COLUMNS order
+"""
+
+import array
+import os
+import struct
+import sys
+import time
+
+from levels import DIFFICULTIES
+
+
+MAGIC = b"BCDL"
+VERSION = 1
+BLOCK_MAGIC = b"BLK0"
+FILE_HEADER = struct.Struct("<4sH")
+BLOCK_HEADER = struct.Struct("<4sI")
+FILE_SUFFIX = ".bcd"
+
+FLUSH_SECONDS = 10.0
+DEFAULT_MAX_FILES = 64   # 512 MB of logs at the default file size
+
+# (name, array typecode)
+COLUMNS = (
+    ("time", "d"),          # wall clock seconds at impact
+    ("level", "I"),
+    ("speed", "f"),
+    ("spawn_x", "h"),
+    ("player_x", "f"),      # player centre when the drop resolved
+    ("hit", "B"),
+    ("reaction_ms", "i"),   # spawn to first movement key, -1 if the player never moved
+    ("difficulty", "B"),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+
+class DropLogger:
+    def __init__(self, directory, buffer_size=256, max_file_bytes=8 * 1024 * 1024, max_files=DEFAULT_MAX_FILES,
+                 flush_seconds=FLUSH_SECONDS):
+        """Log drops to rotating files in directory, flushing every buffer_size records or
+        flush_seconds, whichever comes first. max_files=None keeps every file."""
+        self.directory = directory
+        self.buffer_size = buffer_size
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.flush_seconds = flush_seconds
+        self._columns = {name: array.array(code) for name, code in COLUMNS}
+        self._count = 0
+        self._flushed_at = time.monotonic()
+        self._path = None
+        os.makedirs(directory, exist_ok=True)
+
+    def record(self, level, speed, spawn_x, player_x, hit, reaction_ms, difficulty):
+        """Buffer one drop; writes only happen when the buffer is full or old enough."""
+        columns = self._columns
+        columns["time"].append(time.time())
+        columns["level"].append(level)
+        columns["speed"].append(speed)
+        columns["spawn_x"].append(int(spawn_x))
+        columns["player_x"].append(player_x)
+        columns["hit"].append(1 if hit else 0)
+        columns["reaction_ms"].append(-1 if reaction_ms is None else int(reaction_ms))
+        columns["difficulty"].append(DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else 255)
+        self._count += 1
+        if self._count >= self.buffer_size or time.monotonic() - self._flushed_at >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records as one block, rotating the file when it is full."""
+        self._flushed_at = time.monotonic()
+        if not self._count:
+            return
+        path = self._current_path()
+        with open(path, "ab") as f:
+            if f.tell() == 0:
+                f.write(FILE_HEADER.pack(MAGIC, VERSION))
+            f.write(BLOCK_HEADER.pack(BLOCK_MAGIC, self._count))
+            for name, code in COLUMNS:
+                column = self._columns[name]
+                if sys.byteorder == "big":
+                    column.byteswap()
+                column.tofile(f)
+                self._columns[name] = array.array(code)
+        self._count = 0
+
+    def close(self):
+        self.flush()
+
+    def _current_path(self):
+        if self._path is None or (os.path.exists(self._path) and os.path.getsize(self._path) >= self.max_file_bytes):
+            self._path = self._next_path()
+        return self._path
+
+    def _next_path(self):
+        existing = list_log_files(self.directory)
+        index = 1
+        if existing:
+            index = int(os.path.basename(existing[-1])[len("drops-"):-len(FILE_SUFFIX)]) + 1
+        if self.max_files is not None:
+            for old in existing[:max(0, len(existing) - self.max_files + 1)]:
+                os.remove(old)
+        return os.path.join(self.directory, f"drops-{index:06d}{FILE_SUFFIX}")
+
+
+def list_log_files(directory):
+    """Return the log files in a directory, oldest first."""
+    names = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith("drops-") and name.endswith(FILE_SUFFIX)
+    )
+    return [os.path.join(directory, name) for name in names]
+
+
+def iter_blocks(path):
+    """Yield each block of a log file as {column name: array}, one block in memory at a time."""
+    with open(path, "rb") as f:
+        header = f.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size:
+            return
+        magic, version = FILE_HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} drop log")
+        while True:
+            header = f.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                return
+            magic, count = BLOCK_HEADER.unpack(header)
+            if magic != BLOCK_MAGIC:
+                raise ValueError(f"{path}: corrupt block header")
+            block = {}
+            for name, code in COLUMNS:
+                column = array.array(code)
+                try:
+                    column.fromfile(f, count)
+                except EOFError:
+                    # Truncated tail block (e.g. the game was killed mid-write)
+                    return
+                if sys.byteorder == "big":
+                    column.byteswap()
+                block[name] = column
+            yield block
@@ -0,0 +1,77 @@
+"""
+Analytics Query - aggregate drop logs by streaming them block by block
+
+Usage:
+    python src/analytics_query.py LOG_DIR_OR_FILE... [--by level|spawn_x|difficulty] [--bucket N]
+"""
+
+import argparse
+import os
+
+from analytics import DIFFICULTIES, iter_blocks, list_log_files
+
+
+def expand_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from list_log_files(path)
+        else:
+            yield path
+
+
+def aggregate(paths, by="level", bucket=1, difficulty=None):
+    """Return {key: [drops, hits, reaction_ms_total, reactions]} without loading whole files."""
+    difficulty_code = None if difficulty is None else DIFFICULTIES.index(difficulty)
+    totals = {}
+    for path in expand_paths(paths):
+        for block in iter_blocks(path):
+            keys = block[by]
+            hits = block["hit"]
+            reactions = block["reaction_ms"]
+            difficulties = block["difficulty"]
+            for i in range(len(keys)):
+                if difficulty_code is not None and difficulties[i] != difficulty_code:
+                    continue
+                key = keys[i]
+                if bucket > 1:
+                    key = key // bucket * bucket
+                entry = totals.get(key)
+                if entry is None:
+                    entry = totals[key] = [0, 0, 0, 0]
+                entry[0] += 1
+                entry[1] += hits[i]
+                if reactions[i] >= 0:
+                    entry[2] += reactions[i]
+                    entry[3] += 1
+    return totals
+
+
+def format_key(by, key, bucket):
+    if by == "difficulty":
+        return DIFFICULTIES[key] if key < len(DIFFICULTIES) else "?"
+    if bucket > 1:
+        return f"{key}-{key + bucket - 1}"
+    return str(key)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate Ball Catch drop logs")
+    parser.add_argument("paths", nargs="+", help="log files or directories")
+    parser.add_argument("--by", choices=["level", "spawn_x", "difficulty"], default="level")
+    parser.add_argument("--bucket", type=int, default=None,
+                        help="bucket width (default 50 for spawn_x, 1 otherwise)")
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, help="only count drops on this difficulty")
+    args = parser.parse_args(argv)
+
+    bucket = args.bucket or (50 if args.by == "spawn_x" else 1)
+    totals = aggregate(args.paths, args.by, bucket, args.difficulty)
+
+    print(f"{args.by:>12} {'drops':>10} {'hits':>10} {'hit rate':>9} {'reaction':>10}")
+    for key in sorted(totals):
+        drops, hits, reaction_total, reactions = totals[key]
+        reaction = f"{reaction_total / reactions:.0f}ms" if reactions else "-"
+        print(f"{format_key(args.by, key, bucket):>12} {drops:>10} {hits:>10} {hits / drops:>8.1%} {reaction:>10}")
+
+
+if __name__ == "__main__":
+    main()
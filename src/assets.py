@@ -0,0 +1,233 @@
+"""
+Assets - decode-once image and sound cache with background preloading
+
+Each asset is read from disk once and kept in a size-bounded LRU keyed by
+(path, mtime), so editing a file on disk invalidates it but nothing else does.
+The manifest is read on a background thread during the loading screen. Images
+are decoded on the Tk thread (Tk is not thread-safe) the first time they are
+used, and every later use shares the same decoded photo.
+"""
+
+import base64
+import collections
+import os
+import queue
+import threading
+import time
+
+try:
+    import winsound
+except ImportError:  # pragma: no cover
+    winsound = None
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Everything preloaded while the loading screen is up (see assets/comment.py)
+ASSET_MANIFEST = (
+    "assets/player1.png",
+    "assets/player2.png",
+    "assets/ball.png",
+    "assets/goal_sound.wav",
+)
+
+# Game sound name -> sound file; names without a file fall back to system beeps
+SOUND_FILES = {
+    "hit": "assets/goal_sound.wav",
+}
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+REVALIDATE_SECONDS = 2.0
+
+
+def resolve(path):
+    return path if os.path.isabs(path) else os.path.join(ROOT_DIR, path)
+
+
+class _Entry:
+    __slots__ = ("data", "decoded", "size")
+
+    def __init__(self, data):
+        self.data = data
+        self.decoded = None
+        self.size = len(data)
+
+
+class AssetManager:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, revalidate_seconds=REVALIDATE_SECONDS):
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self._entries = collections.OrderedDict()
+        self._mtimes = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._preload_thread = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def preload(self, paths=ASSET_MANIFEST):
+        """Read every asset in the manifest on a background thread."""
+        self._preload_thread = threading.Thread(target=self._preload, args=(tuple(paths),),
+                                                name="asset-preload", daemon=True)
+        self._preload_thread.start()
+
+    def wait_for_preload(self, timeout=None):
+        if self._preload_thread is not None:
+            self._preload_thread.join(timeout)
+
+    def _preload(self, paths):
+        for path in paths:
+            key = self._key(resolve(path), force=True)
+            if key is None:
+                continue
+            with self._lock:
+                if key in self._entries:
+                    continue
+            self._load(key)
+
+    def _key(self, path, force=False):
+        """Return (path, mtime), only asking the filesystem every few seconds per path."""
+        now = time.monotonic()
+        known = self._mtimes.get(path)
+        if known is not None and not force and now - known[1] < self.revalidate_seconds:
+            return (path, known[0])
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._mtimes.pop(path, None)
+            return None
+        self._mtimes[path] = (mtime, now)
+        return (path, mtime)
+
+    def _load(self, key):
+        try:
+            with open(key[0], "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        entry = _Entry(data)
+        with self._lock:
+            self._insert(key, entry)
+        return entry
+
+    def _insert(self, key, entry):
+        # Drop any older version of the same file first
+        for stale in [k for k in self._entries if k[0] == key[0] and k != key]:
+            self._bytes -= self._entries.pop(stale).size
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def _get(self, path):
+        key = self._key(resolve(path))
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        return self._load(key)
+
+    def data(self, path):
+        """Return the raw bytes of an asset, or None if it does not exist."""
+        entry = self._get(path)
+        return None if entry is None else entry.data
+
+    def photo(self, path):
+        """Return the decoded Tk photo for an image asset. Call from the Tk thread only."""
+        entry = self._get(path)
+        if entry is None:
+            return None
+        if entry.decoded is None:
+            import graphics
+            import tkinter as tk
+            entry.decoded = tk.PhotoImage(data=base64.b64encode(entry.data), master=graphics._root)
+            # Account for the decoded pixels (4 bytes each) as well as the file bytes
+            with self._lock:
+                extra = entry.decoded.width() * entry.decoded.height() * 4
+                entry.size += extra
+                self._bytes += extra
+        return entry.decoded
+
+    def image(self, path, x, y):
+        """Return a graphics.Image at (x, y) that shares the cached decoded photo.
+
+        Raises FileNotFoundError for a missing file, as graphics.Image would.
+        """
+        from graphics import Image, Point
+        photo = self.photo(path)
+        if photo is None:
+            raise FileNotFoundError(f"no such image: {resolve(path)}")
+        image = Image(Point(x, y), 0, 0)
+        image.img = photo
+        return image
+
+    def stats(self):
+        total = self.hits + self.misses
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def report(self):
+        s = self.stats()
+        return (f"Assets: {s['entries']} cached ({s['bytes'] / 1024:.0f} KB), "
+                f"{s['hits']} hits / {s['misses']} misses ({s['hit_rate']:.1%}), {s['evictions']} evictions")
+
+
+# The one cache the game and utils/helper.py share, so preloading helps every image lookup
+shared_assets = AssetManager()
+
+
+class SoundPlayer:
+    """Play cached sounds from memory on a worker thread so the game never waits on audio."""
+
+    def __init__(self, assets, max_queue=8):
+        self.assets = assets
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def play(self, path):
+        """Queue a sound; returns False if it is missing or audio is unavailable."""
+        if winsound is None:
+            return False
+        data = self.assets.data(path)
+        if data is None:
+            return False
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            # A backlog of stale sound effects is worse than a dropped one
+            pass
+        return True
+
+    def _run(self):
+        while True:
+            data = self._queue.get()
+            try:
+                winsound.PlaySound(data, winsound.SND_MEMORY)
+            except RuntimeError:
+                pass
@@ -0,0 +1,303 @@
+"""
+Capture - record gameplay to GIF or raw video without slowing the game down
+
+Frames are rendered offscreen from the simulation snapshot into an 8-bit
+palette framebuffer, not grabbed from the screen. The game thread copies a
+prebuilt background into a free shared-memory slot and stamps the ball and
+player on top; a separate encoder process turns filled slots into GIF or raw
+rgb24 frames. When the encoder falls behind and no slot is free, the frame is
+dropped instead of making the game wait.
+
+Raw output plays back with e.g.
+    ffmpeg -f rawvideo -pixel_format rgb24 -video_size 400x300 -framerate 50 -i clip.rgb clip.mp4
+"""
+
+import multiprocessing
+import queue
+import struct
+from multiprocessing import shared_memory
+
+from simulation import BALL_SPAWN_Y, FRAME_SECONDS, GROUND_Y, HEIGHT, PLAYER_HALF_WIDTH, WIDTH, constant
+
+
+NAMED_COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "green": (0, 128, 0),
+    "lightblue": (173, 216, 230),
+}
+
+# Palette slots
+BACKGROUND, GROUND, BALL, SKIN, HAIR, SHIRT, PANTS, SHOE = range(8)
+
+
+def parse_color(color):
+    if color.startswith("#") and len(color) == 7:
+        return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return NAMED_COLORS.get(color, (255, 0, 255))
+
+
+def circle_spans(radius):
+    """Half-widths of a filled circle for each row offset -radius..radius."""
+    return [(dy, int((radius * radius - dy * dy) ** 0.5)) for dy in range(-radius, radius + 1)]
+
+
+class FrameRenderer:
+    def __init__(self, width, height, scale, settings):
+        self.width = width // scale
+        self.height = height // scale
+        self.scale = scale
+        self.frame_bytes = self.width * self.height
+
+        colors = [None] * 8
+        colors[BACKGROUND] = parse_color(constant.BACKGROUND_COLOR)
+        colors[GROUND] = parse_color(constant.GROUND_COLOR)
+        colors[BALL] = parse_color(constant.BALL_COLOR)
+        colors[SKIN] = parse_color(settings.skin_color)
+        colors[HAIR] = parse_color(settings.hair_color)
+        colors[SHIRT] = parse_color(settings.shirt_color)
+        colors[PANTS] = parse_color(settings.pants_color)
+        colors[SHOE] = parse_color("black")
+        self.palette = colors + [(0, 0, 0)] * (256 - len(colors))
+
+        self.background = bytearray([BACKGROUND]) * self.frame_bytes
+        self._fill(self.background, 0, GROUND_Y, width, height, GROUND)
+        self._ball_spans = circle_spans(max(1, constant.BALL_RADIUS // scale))
+        self._head_spans = circle_spans(max(1, 16 // scale))
+
+    def _fill(self, buf, x0, y0, x1, y1, color):
+        s = self.scale
+        x0 = max(0, int(x0) // s)
+        x1 = min(self.width, int(x1) // s)
+        y0 = max(0, int(y0) // s)
+        y1 = min(self.height, int(y1) // s)
+        if x1 <= x0:
+            return
+        span = bytes([color]) * (x1 - x0)
+        w = self.width
+        for row in range(y0, y1):
+            start = row * w + x0
+            buf[start:start + (x1 - x0)] = span
+
+    def _disc(self, buf, cx, cy, spans, color):
+        s = self.scale
+        cx //= s
+        cy //= s
+        w = self.width
+        for dy, half in spans:
+            row = int(cy) + dy
+            if 0 <= row < self.height:
+                x0 = max(0, int(cx) - half)
+                x1 = min(w, int(cx) + half + 1)
+                if x1 > x0:
+                    buf[row * w + x0:row * w + x1] = bytes([color]) * (x1 - x0)
+
+    def render(self, buf, view):
+        """Draw a SimSnapshot into buf (any writable buffer of frame_bytes)."""
+        buf[:] = self.background
+
+        x = view.player_x
+        foot_y = GROUND_Y
+        body_top = foot_y - 76
+        self._disc(buf, x, body_top - 22, self._head_spans, SKIN)
+        self._fill(buf, x - 16, body_top - 38, x + 16, body_top - 28, HAIR)
+        self._fill(buf, x - PLAYER_HALF_WIDTH, body_top + 4, x + PLAYER_HALF_WIDTH, body_top + 38, SKIN)
+        self._fill(buf, x - 30, body_top, x + 30, body_top + 44, SHIRT)
+        self._fill(buf, x - 26, body_top + 44, x + 26, foot_y - 8, PANTS)
+        self._fill(buf, x - 26, foot_y - 8, x + 26, foot_y, SHOE)
+
+        if view.ball_x is not None:
+            self._disc(buf, view.ball_x, view.ball_y if view.ball_y is not None else BALL_SPAWN_Y,
+                       self._ball_spans, BALL)
+
+
+class FrameCapture:
+    def __init__(self, path, settings, width=WIDTH, height=HEIGHT, scale=2, slots=8, every=1, frame_seconds=FRAME_SECONDS):
+        """Capture every `every`-th simulation frame to path (.gif for GIF, anything else for raw rgb24)."""
+        self.path = path
+        self.format = "gif" if path.lower().endswith(".gif") else "raw"
+        self.renderer = FrameRenderer(width, height, scale, settings)
+        self.slots = slots
+        self.every = max(1, every)
+        self.frame_seconds = frame_seconds
+
+        self._last_bucket = None
+        self.captured = 0
+        self.dropped = 0
+        self._shm = None
+        self._free = None
+        self._filled = None
+        self._process = None
+
+    def start(self):
+        size = self.renderer.frame_bytes
+        self._shm = shared_memory.SharedMemory(create=True, size=size * self.slots)
+        ctx = multiprocessing.get_context("spawn")
+        self._free = ctx.Queue()
+        self._filled = ctx.Queue()
+        for slot in range(self.slots):
+            self._free.put(slot)
+        delay_cs = max(2, round(self.frame_seconds * self.every * 100))
+        self._process = ctx.Process(
+            target=encoder_main,
+            args=(self._shm.name, size, self.renderer.width, self.renderer.height, self.renderer.palette,
+                  self.format, self.path, delay_cs, self._free, self._filled),
+            name="capture-encoder",
+            daemon=True,
+        )
+        self._process.start()
+
+    def capture(self, view):
+        """Called once per rendered frame: one buffer copy plus the moving sprites, never a wait.
+
+        Frames are picked by the simulation frame number, not by calls, so a
+        renderer running faster than the simulation (--threaded) neither
+        repeats frames nor stretches the clip's timing.
+        """
+        bucket = view.frame // self.every
+        if self._shm is None or bucket == self._last_bucket:
+            return
+        self._last_bucket = bucket
+        try:
+            slot = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+        size = self.renderer.frame_bytes
+        self.renderer.render(self._shm.buf[slot * size:(slot + 1) * size], view)
+        self._filled.put(slot)
+        self.captured += 1
+
+    def close(self):
+        """Let the encoder finish queued frames, then release the shared memory."""
+        if self._shm is None:
+            return
+        self._filled.put(None)
+        self._process.join(timeout=30)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def report(self):
+        return f"Capture: {self.captured} frames written to {self.path}, {self.dropped} dropped"
+
+
+def encoder_main(shm_name, size, width, height, palette, fmt, path, delay_cs, free, filled):
+    """Encoder process: turn filled slots into output frames and hand the slots back."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        with open(path, "wb") as out:
+            if fmt == "gif":
+                writer = GifWriter(out, width, height, palette, delay_cs)
+            else:
+                writer = RawWriter(out, palette)
+            while True:
+                slot = filled.get()
+                if slot is None:
+                    break
+                frame = bytes(shm.buf[slot * size:(slot + 1) * size])
+                free.put(slot)
+                writer.write(frame)
+            writer.close()
+    finally:
+        shm.close()
+
+
+class RawWriter:
+    def __init__(self, out, palette):
+        self.out = out
+        self.tables = [bytes(color[channel] for color in palette) for channel in range(3)]
+
+    def write(self, frame):
+        rgb = bytearray(len(frame) * 3)
+        for channel, table in enumerate(self.tables):
+            rgb[channel::3] = frame.translate(table)
+        self.out.write(rgb)
+
+    def close(self):
+        pass
+
+
+class GifWriter:
+    def __init__(self, out, width, height, palette, delay_cs):
+        self.out = out
+        self.width = width
+        self.height = height
+        self.delay_cs = delay_cs
+        out.write(b"GIF89a")
+        out.write(struct.pack("<HHBBB", width, height, 0xF7, 0, 0))
+        out.write(b"".join(bytes(color) for color in palette))
+        # Loop forever (NETSCAPE2.0 application extension)
+        out.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+
+    def write(self, frame):
+        out = self.out
+        out.write(struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 0, self.delay_cs, 0, 0))
+        out.write(struct.pack("<BHHHHB", 0x2C, 0, 0, self.width, self.height, 0))
+        out.write(b"\x08")
+        data = lzw_encode(frame)
+        for i in range(0, len(data), 255):
+            chunk = data[i:i + 255]
+            out.write(bytes([len(chunk)]))
+            out.write(chunk)
+        out.write(b"\x00")
+
+    def close(self):
+        self.out.write(b"\x3b")
+
+
+def lzw_encode(pixels, min_code_size=8):
+    """GIF-flavoured LZW: variable-width codes, LSB first, reset when the table fills."""
+    clear = 1 << min_code_size
+    end = clear + 1
+    out = bytearray()
+    bit_buffer = 0
+    bit_count = 0
+
+    code_size = min_code_size + 1
+    next_code = end + 1
+    table = {}
+
+    def emit(code):
+        nonlocal bit_buffer, bit_count
+        bit_buffer |= code << bit_count
+        bit_count += code_size
+        while bit_count >= 8:
+            out.append(bit_buffer & 0xFF)
+            bit_buffer >>= 8
+            bit_count -= 8
+
+    emit(clear)
+    if not pixels:
+        emit(end)
+        if bit_count:
+            out.append(bit_buffer & 0xFF)
+        return bytes(out)
+
+    prefix = pixels[0]
+    for pixel in pixels[1:]:
+        key = (prefix << 8) | pixel
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix)
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+            if next_code > (1 << code_size) and code_size < 12:
+                code_size += 1
+        else:
+            emit(clear)
+            table.clear()
+            code_size = min_code_size + 1
+            next_code = end + 1
+        prefix = pixel
+    emit(prefix)
+    emit(end)
+    if bit_count:
+        out.append(bit_buffer & 0xFF)
+    return bytes(out)
@@ -6,6 +6,7 @@ A complete 2D ball catching game with modern UI/UX
 from graphics import *
 import time
 import random
+import threading
 import math
 import os
 try:
@@ -14,6 +15,19 @@ except ImportError:  # pragma: no cover
     winsound = None
 from enum import Enum
 
+from analytics import DEFAULT_MAX_FILES, DropLogger
+from assets import SOUND_FILES, SoundPlayer, shared_assets
+from capture import FrameCapture
+from levels import DIFFICULTIES, load as load_levels
+from metrics import GameMetrics, MetricsServer
+from particles import ParticleSystem
+import savestate
+from simulation import (
+    BALL_SPAWN_Y, GROUND_Y, PLAYER_HALF_WIDTH, PLAYER_TOP_Y, GameSimulation, InputLog, SimulationThread, constant,
+)
+from telemetry import TelemetryPublisher
+import verify
+
 class GameState(Enum):
     LOADING = 1
     MENU = 2
@@ -33,6 +47,17 @@ class GameSettings:
         self.shirt_color = "#2563eb"
         self.pants_color = "#111827"
         self.difficulty = "normal"
+        self.telemetry_address = None
+        self.analytics_dir = None
+        self.analytics_max_files = DEFAULT_MAX_FILES
+        self.threaded_simulation = False
+        self.save_path = savestate.DEFAULT_PATH
+        self.autosave_seconds = 5
+        self.asset_stats = False
+        self.capture_path = None
+        self.capture_every = 1
+        self.metrics_address = None
+        self.submit_url = None
 
 
 class PlayerSprite:
@@ -136,18 +161,16 @@ class PlayerSprite:
         return self._p2
 
 class BallCatchGame:
-    def __init__(self):
-        self.settings = GameSettings()
+    def __init__(self, settings=None):
+        self.settings = settings or GameSettings()
         self.window = None
         self.state = GameState.LOADING
-        self.width = 800
-        self.height = 600
-        
-        # Game variables
-        self.chances = 3
-        self.level = 1
-        self.speed = 2
-        self.score = 0
+        self.width = constant.WINDOW_WIDTH
+        self.height = constant.WINDOW_HEIGHT
+        
+        # Game variables: the simulation owns them, the UI reads its latest snapshot
+        self.sim = GameSimulation(self.settings.difficulty)
+        self.view = self.sim.snapshot()
         self.round_missed_in_level = False
         
         # Game objects
@@ -166,13 +189,77 @@ class BallCatchGame:
         # Animation variables
         self.animation_counter = 0
         self.fade_alpha = 0
+        self.particles = None
+        self._transient_effects = []
+
+        # Pacing: seconds slept per frame, and a multiplier on effect durations
+        self.frame_delay = 0.02
+        self.effect_time_scale = 1.0
+
+        # Live state stream for spectator/monitoring views
+        self.telemetry = None
+
+        # Per-drop analytics
+        self.drop_log = None
+        self._drop_spawn_x = 0
+        self._drop_started = 0.0
+        self._drop_first_input = None
+
+        # Suspend/resume
+        self._resume = None
+        self._last_save = 0.0
+
+        # Images and sounds, decoded once and shared
+        self.assets = shared_assets
+        self.sounds = SoundPlayer(self.assets)
+
+        # Gameplay recording (offscreen, encoded in another process)
+        self.capture = None
+
+        # Always-on counters; the HTTP endpoint that serves them is opt-in
+        self.metrics = GameMetrics(GameState, lambda: self.state, lambda: self.sounds.depth)
+        self.metrics_server = None
+
+        # Seed and inputs of the current game, so a verification server can replay it
+        self.run_seed = None
+        self.input_log = None
 
-        self._missed_this_level = False
+    @property
+    def level(self):
+        return self.view.level
+
+    @property
+    def chances(self):
+        return self.view.chances
+
+    @property
+    def speed(self):
+        return self.view.speed
+
+    @property
+    def score(self):
+        return self.view.score
         
     def create_window(self):
         """Create the game window"""
         self.window = GraphWin("Ball Catch Game", self.width, self.height)
         self.window.setBackground("black")
+        self.particles = ParticleSystem(self.window)
+
+    def wait_with_effects(self, seconds):
+        """Sleep for an effect's duration while keeping particles animating."""
+        seconds *= self.effect_time_scale
+        if self.particles is None or not self.particles.live:
+            time.sleep(seconds)
+            return
+        end = time.perf_counter() + seconds
+        while True:
+            remaining = end - time.perf_counter()
+            if remaining <= 0 or self.window.isClosed():
+                break
+            self.particles.update(0.02)
+            self.window.update()
+            time.sleep(min(0.02, remaining))
 
     def safe_get_key(self):
         """Read a key without crashing if the window is closed."""
@@ -189,14 +276,21 @@ class BallCatchGame:
             return
         for item in self.window.items[:]:
             item.undraw()
+        if self.particles is not None:
+            self.particles.clear()
         
     def play_sound(self, sound_name):
-        """Play sound effects using Windows system audio (no external files)."""
+        """Play a sound effect: its cached file from assets/ if there is one, else a Windows system beep."""
         if not self.settings.sound_enabled:
             return
         if winsound is None:
             return
 
+        # Prefer a sound file from assets/ when there is one
+        path = SOUND_FILES.get(sound_name)
+        if path is not None and self.sounds.play(path):
+            return
+
         if sound_name == "hit":
             winsound.MessageBeep(winsound.MB_ICONASTERISK)
         elif sound_name == "miss":
@@ -273,10 +367,12 @@ class BallCatchGame:
             "4. Settings",
             "5. Exit"
         ]
+        if self.has_saved_session():
+            options.append("6. Resume Game")
         
         self.menu_texts = []
         for i, option in enumerate(options):
-            text = Text(Point(self.width//2, 250 + i*60), option)
+            text = Text(Point(self.width//2, 230 + i*55), option)
             text.setSize(24)
             text.setTextColor("white")
             text.draw(self.window)
@@ -299,6 +395,9 @@ class BallCatchGame:
         title.setTextColor("white")
         title.draw(self.window)
         
+        # Progression comes from config/levels.json for the selected difficulty
+        table = load_levels(width=self.width).table(self.settings.difficulty)
+        table.extend(2)
         instructions = [
             "🎮 CONTROLS:",
             "• Use LEFT and RIGHT arrow keys to move",
@@ -310,14 +409,14 @@ class BallCatchGame:
             "• Each drop costs 1 chance (attempt)",
             "• Catching the ball clears the level",
             "",
-            "� PROGRESSION:",
-            "• On catch: Level +1 and Chances +3",
+            f"� PROGRESSION ({self.settings.difficulty}):",
+            f"• On catch: Level +1 and Chances +{table.chances_per_catch[1]}",
             "• Remaining chances carry over",
-            "• Speed increases each level",
+            f"• Speed {table.speed[1]:g} on level 1, {table.speed[2]:g} on level 2, ...",
             "",
             "🏆 SCORING:",
-            "• Points = Level × 10 per catch",
-            "• Higher levels = more points",
+            f"• Points per catch: {table.points[1]} on level 1, {table.points[2]} on level 2, ...",
+            "• Values come from config/levels.json",
             "",
             "Press ESC to return to main menu"
         ]
@@ -407,32 +506,47 @@ class BallCatchGame:
         for it in items:
             it.draw(self.window)
 
-    def initialize_game(self):
-        """Initialize game objects"""
+    def initialize_game(self, resume=None):
+        """Initialize game objects, or rebuild a suspended game from a (snapshot, difficulty) pair"""
         self.clear_screen()
-        self.window.setBackground("lightblue")
+        self.window.setBackground(constant.BACKGROUND_COLOR)
 
-        self.chances = 3
-        self.level = 1
-        self.speed = 2
-        self.score = 0
+        if resume is None:
+            self.run_seed = random.getrandbits(63)
+            self.input_log = InputLog()
+            self.sim = GameSimulation(self.settings.difficulty, seed=self.run_seed)
+        else:
+            # The random state is not part of a snapshot, so a resumed game cannot be replayed
+            self.run_seed = None
+            self.input_log = None
+            snapshot, difficulty = resume
+            self.sim = GameSimulation(difficulty)
+            self.sim.restore(snapshot)
+        self.view = self.sim.snapshot()
+        self.ball = None
         self.round_missed_in_level = False
+        self._transient_effects = []
             
         # Draw ground
-        self.ground = Rectangle(Point(0, self.height - 50), Point(self.width, self.height))
-        self.ground.setFill("green")
+        self.ground = Rectangle(Point(0, self.height - constant.GROUND_HEIGHT), Point(self.width, self.height))
+        self.ground.setFill(constant.GROUND_COLOR)
         self.ground.draw(self.window)
         
         # Draw player (human sprite)
         self.player = PlayerSprite(
             self.window,
-            self.width // 2,
-            self.height - 50,
+            self.view.player_x,
+            GROUND_Y,
             self.settings.skin_color,
             self.settings.hair_color,
             self.settings.shirt_color,
             self.settings.pants_color,
         )
+
+        # A suspended game may have had a ball in flight
+        if self.view.ball_x is not None:
+            self.create_new_ball(self.view.ball_x)
+            self.sync_scene()
         
         # Initialize UI text
         self.level_text = Text(Point(50, 30), f"Level: {self.level}")
@@ -472,50 +586,154 @@ class BallCatchGame:
         if self.speed_text:
             self.speed_text.setText(f"Speed: {self.speed:.1f}")
 
-    def create_new_ball(self):
-        """Create a new falling ball"""
-        x = random.randint(20, self.width - 20)
-        self.ball = Circle(Point(x, 20), 10)
-        self.ball.setFill("red")
+    def has_saved_session(self):
+        return self.settings.save_path is not None and savestate.exists(self.settings.save_path)
+
+    def save_session(self, durable=True):
+        """Write the current game to the suspend file."""
+        if self.settings.save_path is None:
+            return
+        try:
+            savestate.save(self.settings.save_path, self.view, self.sim.difficulty, durable)
+        except OSError:
+            return
+        self._last_save = time.perf_counter()
+
+    def autosave(self):
+        if time.perf_counter() - self._last_save >= self.settings.autosave_seconds:
+            # Runs on the frame loop, so no fsync; pause, quit and close still sync
+            self.save_session(durable=False)
+
+    def publish_telemetry(self):
+        """Send the current game state to telemetry subscribers, if enabled."""
+        if self.telemetry is None:
+            return
+        view = self.view
+        ball = None
+        if view.ball_x is not None:
+            ball = (view.ball_x, view.ball_y)
+        player = None
+        if self.player:
+            player = (view.player_x - PLAYER_HALF_WIDTH, PLAYER_TOP_Y, view.player_x + PLAYER_HALF_WIDTH, GROUND_Y)
+        self.telemetry.publish({
+            "state": self.state.name,
+            "level": self.level,
+            "chances": self.chances,
+            "score": self.score,
+            "speed": round(self.speed, 2),
+            "ball": ball,
+            "player": player,
+        })
+
+    def create_new_ball(self, x=None):
+        """Create a new falling ball at x, or spawn one in the simulation first"""
+        if x is None:
+            x = self.sim.spawn_ball()
+            self.view = self.sim.snapshot()
+        self.ball = Circle(Point(x, BALL_SPAWN_Y), constant.BALL_RADIUS)
+        self.ball.setFill(constant.BALL_COLOR)
         self.ball.draw(self.window)
+
+        self._drop_spawn_x = x
+        self._drop_started = time.perf_counter()
+        self._drop_first_input = None
+
+    def sync_scene(self):
+        """Move the drawn ball and player to where the latest snapshot has them."""
+        view = self.view
+        if self.ball is not None and view.ball_y is not None:
+            dy = view.ball_y - self.ball.getCenter().getY()
+            if dy:
+                self.ball.move(0, dy)
+        if self.player is not None:
+            dx = view.player_x - (self.player.getP1().getX() + self.player.getP2().getX()) / 2
+            if dx:
+                self.player.move(dx, 0)
+
+    def submit_run(self):
+        """Send the finished game to the verification server in the background, if one is configured."""
+        if self.settings.submit_url is None or self.input_log is None:
+            return
+        submission = verify.make_submission(
+            self.run_seed, self.sim.difficulty, self.input_log.runs, self.score, self.level, self.chances,
+        )
+        url = self.settings.submit_url
+
+        def send():
+            try:
+                result = verify.submit_run(url, submission)
+            except (OSError, ValueError) as exc:
+                print(f"Score submission failed: {exc}")
+                return
+            print(f"Score {submission['score']}: {'verified' if result.get('valid') else 'rejected'} "
+                  f"({result.get('reason', '')})")
+
+        threading.Thread(target=send, name="submit-run", daemon=True).start()
+
+    def capture_frame(self):
+        if self.capture is not None:
+            self.capture.capture(self.view)
+
+    def log_drop(self, drop):
+        """Count the drop that just resolved and buffer its analytics record."""
+        self.metrics.drop(drop.hit)
+        if self.drop_log is None:
+            return
+        reaction_ms = None
+        if self._drop_first_input is not None:
+            reaction_ms = (self._drop_first_input - self._drop_started) * 1000
+        self.drop_log.record(
+            level=drop.level,
+            speed=drop.speed,
+            spawn_x=drop.spawn_x,
+            player_x=drop.player_x,
+            hit=drop.hit,
+            reaction_ms=reaction_ms,
+            difficulty=self.sim.difficulty,
+        )
+
+
+    def finish_effect(self, effect, seconds, blocking=True):
+        """Hold an effect on screen, or leave it to expire later when the simulation runs on its own thread."""
+        if blocking:
+            self.wait_with_effects(seconds)
+            effect.undraw()
+        else:
+            self._transient_effects.append((time.perf_counter() + seconds * self.effect_time_scale, effect))
+
+    def expire_effects(self):
+        now = time.perf_counter()
+        for entry in self._transient_effects[:]:
+            if entry[0] <= now:
+                entry[1].undraw()
+                self._transient_effects.remove(entry)
         
-    def check_collision(self):
-        """Check if ball collides with player"""
-        if not self.ball or not self.player:
-            return False
-            
-        ball_center = self.ball.getCenter()
-        player_p1 = self.player.getP1()
-        player_p2 = self.player.getP2()
-        
-        # Check if ball is at player height and within player width
-        if (ball_center.getY() >= player_p1.getY() - 10 and
-            player_p1.getX() <= ball_center.getX() <= player_p2.getX()):
-            return True
-        return False
-        
-    def show_hit_effect(self):
+    def show_hit_effect(self, blocking=True):
         """Show visual effect when ball is caught"""
-        effect = Text(Point(self.ball.getCenter().getX(), self.ball.getCenter().getY() - 20), "HIT!")
+        center = self.ball.getCenter()
+        effect = Text(Point(center.getX(), center.getY() - 20), "HIT!")
         effect.setSize(20)
         effect.setStyle("bold")
         effect.setTextColor("green")
         effect.draw(self.window)
-        time.sleep(0.5)
-        effect.undraw()
+        if self.particles is not None:
+            self.particles.emit(center.getX(), center.getY(), 40, color="#22c55e")
+        self.finish_effect(effect, 0.5, blocking)
 
-    def show_perfect_effect(self):
+    def show_perfect_effect(self, blocking=True):
         effect = Text(Point(self.width // 2, 90), "PERFECT!")
         effect.setSize(26)
         effect.setStyle("bold")
         effect.setTextColor("#22c55e")
         effect.draw(self.window)
-        time.sleep(0.8)
-        effect.undraw()
+        self.finish_effect(effect, 0.8, blocking)
 
     def pause_overlay(self):
         """Pause overlay that resumes without resetting game state."""
         self.state = GameState.PAUSED
+        # The overlay blocks on a key, so spectators would otherwise never see the pause
+        self.publish_telemetry()
+        self.save_session()
 
         panel = Rectangle(Point(160, 210), Point(self.width - 160, 390))
         panel.setFill("#0f172a")
@@ -550,29 +768,34 @@ class BallCatchGame:
         hint.undraw()
         panel.undraw()
         
-    def show_miss_effect(self):
+    def show_miss_effect(self, blocking=True):
         """Show visual effect when ball is missed"""
         effect = Text(Point(self.ball.getCenter().getX(), self.height - 25), "MISS!")
         effect.setSize(20)
         effect.setStyle("bold")
         effect.setTextColor("red")
         effect.draw(self.window)
-        time.sleep(0.5)
-        effect.undraw()
+        self.finish_effect(effect, 0.5, blocking)
         
-    def show_level_up(self):
+    def show_level_up(self, blocking=True):
         """Show level up animation"""
         level_up = Text(Point(self.width//2, self.height//2), f"LEVEL {self.level}!")
         level_up.setSize(36)
         level_up.setStyle("bold")
         level_up.setTextColor("yellow")
         level_up.draw(self.window)
-        time.sleep(1)
-        level_up.undraw()
+        if self.particles is not None:
+            for color in ("yellow", "#f59e0b", "white"):
+                self.particles.emit(self.width // 2, self.height // 2, 60, color=color, speed=260.0, life=1.0)
+        self.finish_effect(level_up, 1, blocking)
         
     def show_game_over(self):
         """Show game over screen"""
         self.clear_screen()
+        self.metrics.game_over(self.level)
+        self.submit_run()
+        if self.settings.save_path is not None:
+            savestate.clear(self.settings.save_path)
 
         self.play_sound("game_over")
 
@@ -595,12 +818,14 @@ class BallCatchGame:
         
     def play_game(self):
         """Main game loop"""
-        self.initialize_game()
+        resume, self._resume = self._resume, None
+        self.initialize_game(resume)
 
         self.play_music_cue("start")
         
         # Show start message
-        start_msg = Text(Point(self.width//2, self.height//2), "Press any key to start!")
+        prompt = "Press any key to resume!" if resume else "Press any key to start!"
+        start_msg = Text(Point(self.width//2, self.height//2), prompt)
         start_msg.setSize(24)
         start_msg.setTextColor("white")
         start_msg.draw(self.window)
@@ -609,55 +834,83 @@ class BallCatchGame:
         if key is None:
             return
         start_msg.undraw()
+        self.metrics.sessions_started.inc()
         
-        self._missed_this_level = False
-        while self.chances > 0 and self.state == GameState.PLAYING:
-            # Each ball drop consumes one chance (attempt)
-            self.chances -= 1
-            self.update_ui()
-            if self.chances < 0:
-                self.chances = 0
+        self._last_save = time.perf_counter()
+        try:
+            if self.settings.threaded_simulation:
+                self.run_drops_threaded()
+            else:
+                self.run_drops()
+        except GraphicsError:
+            # The window was closed mid-game; keep the session for next time
+            self.save_session()
+            self.state = GameState.MENU
+
+    def poll_key(self):
+        """Return the key pressed since the last frame, if any."""
+        return self.window.checkKey()
+
+    def read_move(self, key):
+        """Turn a key from the game loop into a player move, noting the first reaction of each drop."""
+        if key not in ("Left", "Right"):
+            return 0
+        if self._drop_first_input is None:
+            self._drop_first_input = time.perf_counter()
+        return -1 if key == "Left" else 1
 
-            self.create_new_ball()
-            ball_falling = True
-            hit = False
-            missed = False
+    def run_drops(self):
+        """Simulate and draw each frame in turn on the Tk thread"""
+        while (self.chances > 0 or self.ball is not None) and self.state == GameState.PLAYING:
+            # Each ball drop consumes one chance (attempt); a resumed game may already have one in flight
+            if self.ball is None:
+                self.create_new_ball()
+            self.update_ui()
+            result = None
             
-            while ball_falling and self.state == GameState.PLAYING:
-                # Move ball
-                self.ball.move(0, self.speed)
-                
+            while result is None and self.state == GameState.PLAYING:
+                frame_started = time.perf_counter()
+
                 # Handle input
-                key = self.window.checkKey()
-                if key == "Left" and self.player.getP1().getX() > 0:
-                    self.player.move(-6, 0)
-                elif key == "Right" and self.player.getP2().getX() < self.width:
-                    self.player.move(6, 0)
-                elif key == "q":
+                key = self.poll_key()
+                move = self.read_move(key)
+                if key == "q":
+                    self.save_session()
                     self.state = GameState.MENU
                     return
                 elif key == "space":
                     self.pause_overlay()
                     if self.state != GameState.PLAYING:
                         return
-                    
-                # Check collision
-                if self.check_collision():
-                    hit = True
-                    ball_falling = False
-                    self.score += self.level * 10
+
+                # Move ball and player, then check for a catch or a miss
+                if self.input_log is not None:
+                    self.input_log.record(move)
+                result = self.sim.step(move)
+                self.view = self.sim.snapshot()
+                self.sync_scene()
+                self.capture_frame()
+
+                if result == "hit":
+                    self.log_drop(self.sim.last_drop)
                     self.play_sound("hit")
                     self.show_hit_effect()
-                        
-                # Check if ball reached bottom
-                elif self.ball.getCenter().getY() > self.height - 50:
-                    ball_falling = False
-                    missed = True
+                elif result == "miss":
+                    self.log_drop(self.sim.last_drop)
                     self.play_sound("miss")
                     self.show_miss_effect()
                     
+                # Frames that showed a blocking effect or the pause overlay say nothing about load
+                frame_time = None
+                if result is None and key != "space":
+                    frame_time = time.perf_counter() - frame_started
+                    self.metrics.frame_seconds.observe(frame_time)
+                if self.particles is not None:
+                    self.particles.update(0.02, frame_time)
                 self.update_ui()
-                time.sleep(0.02)
+                self.publish_telemetry()
+                self.autosave()
+                time.sleep(self.frame_delay)
                 
             # Clean up ball
             if self.ball:
@@ -665,38 +918,101 @@ class BallCatchGame:
                 self.ball = None
                 
             # Level resolution
-            if hit:
-                if not self._missed_this_level:
+            if result == "hit":
+                if self.sim.last_drop.perfect:
                     self.show_perfect_effect()
-
-                self.level += 1
-                self.chances += 3
-
-                speed_step = 0.6
-                if self.settings.difficulty == "easy":
-                    speed_step = 0.4
-                elif self.settings.difficulty == "hard":
-                    speed_step = 0.85
-                self.speed += speed_step
-
                 self.play_sound("level_up")
                 self.show_level_up()
-                self._missed_this_level = False
 
-            elif missed:
-                self._missed_this_level = True
-                if self.chances <= 0:
-                    self.state = GameState.GAME_OVER
-                    self.show_game_over()
-                    return
+            elif result == "miss" and self.sim.game_over:
+                self.state = GameState.GAME_OVER
+                self.show_game_over()
+                return
                 
         if self.chances <= 0:
             self.state = GameState.GAME_OVER
             self.show_game_over()
+
+    def run_drops_threaded(self):
+        """Render a simulation running at a fixed rate on its own thread"""
+        # Inputs land on whichever simulation frame is next, so this run cannot be replayed
+        self.input_log = None
+        runner = SimulationThread(self.sim)
+        runner.start()
+        frame_seconds = 1 / 60
+        try:
+            while self.state == GameState.PLAYING:
+                frame_started = time.perf_counter()
+
+                key = self.poll_key()
+                move = self.read_move(key)
+                if move:
+                    runner.send_input(move)
+                elif key == "q":
+                    self.save_session()
+                    self.state = GameState.MENU
+                    return
+                elif key == "space":
+                    runner.pause()
+                    self.pause_overlay()
+                    if self.state != GameState.PLAYING:
+                        return
+                    runner.resume()
+
+                # Drain events before taking the snapshot, so it is at least as new as they are
+                events = runner.events()
+                self.view = runner.latest()
+                for kind, data in events:
+                    if kind == "spawn":
+                        self.create_new_ball(data)
+                    elif kind in ("hit", "miss"):
+                        self.handle_threaded_drop(kind, data)
+                    elif kind == "game_over":
+                        self.state = GameState.GAME_OVER
+                        self.show_game_over()
+                        return
+                self.sync_scene()
+                self.capture_frame()
+                self.expire_effects()
+
+                frame_time = time.perf_counter() - frame_started
+                self.metrics.frame_seconds.observe(frame_time)
+                if self.particles is not None:
+                    self.particles.update(frame_seconds, frame_time)
+                self.update_ui()
+                self.publish_telemetry()
+                self.autosave()
+
+                remaining = frame_started + frame_seconds - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+        finally:
+            runner.stop()
+            for _, effect in self._transient_effects:
+                effect.undraw()
+            self._transient_effects = []
+
+    def handle_threaded_drop(self, kind, drop):
+        """Show a resolved drop without blocking; the simulation keeps its own pace."""
+        self.log_drop(drop)
+        if kind == "hit":
+            self.play_sound("hit")
+            self.show_hit_effect(blocking=False)
+            if drop.perfect:
+                self.show_perfect_effect(blocking=False)
+            self.play_sound("level_up")
+            self.show_level_up(blocking=False)
+        else:
+            self.play_sound("miss")
+            self.show_miss_effect(blocking=False)
+        if self.ball:
+            self.ball.undraw()
+            self.ball = None
             
     def handle_menu_input(self, key):
         """Handle input in menu state"""
         if key == "1":
+            self._resume = None
             self.state = GameState.PLAYING
         elif key == "2":
             self.state = GameState.INSTRUCTIONS
@@ -707,6 +1023,10 @@ class BallCatchGame:
         elif key == "5":
             self.window.close()
             return True
+        elif key == "6" and self.settings.save_path is not None:
+            self._resume = savestate.load(self.settings.save_path)
+            if self._resume is not None:
+                self.state = GameState.PLAYING
         return False
         
     def handle_settings_input(self, key):
@@ -724,9 +1044,8 @@ class BallCatchGame:
             current_index = colors.index(self.settings.pants_color)
             self.settings.pants_color = colors[(current_index + 1) % len(colors)]
         elif key == "5":
-            difficulties = ["easy", "normal", "hard"]
-            current_index = difficulties.index(self.settings.difficulty)
-            self.settings.difficulty = difficulties[(current_index + 1) % len(difficulties)]
+            current_index = DIFFICULTIES.index(self.settings.difficulty)
+            self.settings.difficulty = DIFFICULTIES[(current_index + 1) % len(DIFFICULTIES)]
 
     def handle_customize_input(self, key):
         """Handle input in customize state"""
@@ -742,6 +1061,20 @@ class BallCatchGame:
     def run(self):
         """Main game loop"""
         self.create_window()
+        if self.settings.telemetry_address is not None:
+            self.telemetry = TelemetryPublisher(self.settings.telemetry_address)
+            self.telemetry.start()
+        if self.settings.analytics_dir is not None:
+            self.drop_log = DropLogger(self.settings.analytics_dir, max_files=self.settings.analytics_max_files)
+        if self.settings.metrics_address is not None:
+            self.metrics_server = MetricsServer(self.metrics, self.settings.metrics_address)
+            self.metrics_server.start()
+        if self.settings.capture_path is not None:
+            self.capture = FrameCapture(self.settings.capture_path, self.settings,
+                                        self.width, self.height, every=self.settings.capture_every)
+            self.capture.start()
+        # Read the asset manifest while the loading screen is up
+        self.assets.preload()
         self.draw_loading_screen()
         self.state = GameState.MENU
         
@@ -749,6 +1082,7 @@ class BallCatchGame:
         while running:
             if self.window is None or self.window.isClosed():
                 break
+            self.publish_telemetry()
             if self.state == GameState.MENU:
                 self.draw_main_menu()
                 key = self.safe_get_key()
@@ -830,6 +1164,21 @@ class BallCatchGame:
                 pause_text.undraw()
                 hint.undraw()
                 
+        if self.telemetry is not None:
+            self.telemetry.stop()
+            self.telemetry = None
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if self.drop_log is not None:
+            self.drop_log.close()
+            self.drop_log = None
+        if self.settings.asset_stats:
+            print(self.assets.report())
+        if self.capture is not None:
+            self.capture.close()
+            print(self.capture.report())
+            self.capture = None
         if self.window:
             self.window.close()
 
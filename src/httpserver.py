@@ -0,0 +1,44 @@
+"""
+HTTP Server - a ThreadingHTTPServer run on its own daemon thread
+
+Shared by the metrics endpoint and the score verification server. Keyword
+attributes given to the constructor are set on the underlying server, where
+request handlers read them as self.server.<name>.
+"""
+
+import threading
+from http.server import ThreadingHTTPServer
+
+
+class BackgroundHTTPServer:
+    def __init__(self, handler, address, name="http", backlog=None, **attributes):
+        """Serve handler at a (host, port) address; port 0 picks a free port."""
+        self.handler = handler
+        self.address = address
+        self.name = name
+        self.backlog = backlog
+        self.attributes = attributes
+        self._server = None
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1] if self._server is not None else self.address[1]
+
+    def start(self):
+        self._server = ThreadingHTTPServer(self.address, self.handler)
+        self._server.daemon_threads = True
+        if self.backlog is not None:
+            self._server.socket.listen(self.backlog)
+        for name, value in self.attributes.items():
+            setattr(self._server, name, value)
+        self._thread = threading.Thread(target=self._server.serve_forever, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
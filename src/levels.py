@@ -0,0 +1,299 @@
+"""
+Levels - data-driven progression compiled into flat per-level tables
+
+config/levels.json describes each difficulty as a starting point plus stages
+("from level N on, speed goes up by X per catch..."). At load time it is
+validated and compiled into one table per difficulty with a row per level, so
+the simulation looks values up by level instead of re-deriving them.
+
+Compiled tables are cached on disk under the SHA-256 of the source file, so an
+unchanged file is never recompiled. Cache layout (little-endian):
+    header  b"BCLV" + uint16 version + source sha256 + uint16 table count
+    table   uint8 name length + name, uint32 rows, uint32 start chances, then the
+            tail stage (double speed step, int32 points per level, int32 chances
+            per catch, int32 spawn margin), then one packed array per column in
+            COLUMNS order
+    trailer CRC32 of everything before it
+"""
+
+import array
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import zlib
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOURCE = os.path.join(ROOT_DIR, "config", "levels.json")
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".ball_catch", "cache")
+
+MAGIC = b"BCLV"
+VERSION = 2
+HEADER = struct.Struct("<4sH32sH")
+TABLE_HEADER = struct.Struct("<IIdiii")
+CRC = struct.Struct("<I")
+
+# (name, array typecode); row 0 is unused so a level indexes its own row
+COLUMNS = (
+    ("speed", "d"),              # ball speed (pixels per frame) while playing this level
+    ("points", "q"),             # score for a catch on this level
+    ("chances_per_catch", "i"),  # chances added by a catch on this level
+    ("spawn_margin", "i"),       # balls spawn at least this far from either edge
+)
+
+# The difficulty names are fixed: save files and analytics logs store them as
+# an index into this tuple, so neither the names nor their order may change.
+DIFFICULTIES = ("easy", "normal", "hard")
+
+START_FIELDS = ("start_chances", "start_speed")
+STAGE_FIELDS = ("speed_step", "chances_per_catch", "points_per_level", "spawn_margin")
+
+
+class LevelConfigError(ValueError):
+    pass
+
+
+class LevelTable:
+    def __init__(self, name, start_chances, tail, columns):
+        """tail is the last stage's (speed_step, points_per_level, chances_per_catch, spawn_margin)."""
+        self.name = name
+        self.start_chances = start_chances
+        self.tail = tail
+        self.speed = columns["speed"]
+        self.points = columns["points"]
+        self.chances_per_catch = columns["chances_per_catch"]
+        self.spawn_margin = columns["spawn_margin"]
+
+    @property
+    def rows(self):
+        return len(self.speed)
+
+    @property
+    def start_speed(self):
+        return self.speed[1]
+
+    def extend(self, level):
+        """Grow the table past the compiled levels using the last stage's rules."""
+        step, points_per_level, chances, margin = self.tail
+        while len(self.speed) <= level:
+            next_level = len(self.speed)
+            self.speed.append(self.speed[-1] + step)
+            self.points.append(next_level * points_per_level)
+            self.chances_per_catch.append(chances)
+            self.spawn_margin.append(margin)
+
+
+class LevelSet:
+    def __init__(self, tables, source_hash=b""):
+        self.tables = tables
+        self.source_hash = source_hash
+
+    @property
+    def difficulties(self):
+        return tuple(self.tables)
+
+    def table(self, difficulty):
+        """Tables for a difficulty; raises KeyError for a name not in DIFFICULTIES."""
+        try:
+            return self.tables[difficulty]
+        except KeyError:
+            raise KeyError(f"unknown difficulty {difficulty!r}, expected one of {', '.join(DIFFICULTIES)}") from None
+
+
+def _number(value, where, minimum=0, integer=False):
+    kind = int if integer else (int, float)
+    if isinstance(value, bool) or not isinstance(value, kind) or value < minimum:
+        noun = "an integer" if integer else "a number"
+        raise LevelConfigError(f"{where}: must be {noun} >= {minimum}, got {value!r}")
+    return value
+
+
+def _check_keys(obj, allowed, where):
+    if not isinstance(obj, dict):
+        raise LevelConfigError(f"{where}: must be an object")
+    unknown = sorted(set(obj) - set(allowed))
+    if unknown:
+        raise LevelConfigError(f"{where}: unknown key(s) {', '.join(unknown)}")
+
+
+def _check_values(values, where, width):
+    _number(values["start_chances"], f"{where}.start_chances", 1, integer=True)
+    if _number(values["start_speed"], f"{where}.start_speed", 0) <= 0:
+        # A ball that never falls would stall the game loop forever
+        raise LevelConfigError(f"{where}.start_speed: must be greater than 0, got {values['start_speed']!r}")
+    _number(values["speed_step"], f"{where}.speed_step", 0)
+    _number(values["chances_per_catch"], f"{where}.chances_per_catch", 0, integer=True)
+    _number(values["points_per_level"], f"{where}.points_per_level", 0, integer=True)
+    margin = _number(values["spawn_margin"], f"{where}.spawn_margin", 0, integer=True)
+    if margin * 2 > width:
+        raise LevelConfigError(f"{where}.spawn_margin: {margin} leaves no room to spawn in a {width}px window")
+
+
+def compile_levels(config, width=800):
+    """Validate a parsed levels.json and compile it into a LevelSet."""
+    _check_keys(config, ("levels", "defaults", "difficulties"), "levels.json")
+    compiled_rows = _number(config.get("levels", 100), "levels", 1, integer=True) + 1
+    defaults = config.get("defaults", {})
+    _check_keys(defaults, START_FIELDS + STAGE_FIELDS, "defaults")
+    difficulties = config.get("difficulties")
+    if not isinstance(difficulties, dict) or sorted(difficulties) != sorted(DIFFICULTIES):
+        raise LevelConfigError(f"difficulties: must define exactly {', '.join(DIFFICULTIES)}")
+
+    tables = {}
+    for name, spec in difficulties.items():
+        if not isinstance(spec, dict):
+            raise LevelConfigError(f"difficulties.{name}: must be an object")
+        where = f"difficulties.{name}"
+        _check_keys(spec, START_FIELDS + ("stages",), where)
+        values = dict(defaults)
+        values.update((key, spec[key]) for key in START_FIELDS if key in spec)
+
+        stages = spec.get("stages", [{"from_level": 1}])
+        if not isinstance(stages, list) or not stages:
+            raise LevelConfigError(f"{where}.stages: must be a non-empty list")
+        starts = []
+        for i, stage in enumerate(stages):
+            _check_keys(stage, ("from_level",) + STAGE_FIELDS, f"{where}.stages[{i}]")
+            starts.append(_number(stage.get("from_level"), f"{where}.stages[{i}].from_level", 1, integer=True))
+        if starts[0] != 1 or starts != sorted(set(starts)):
+            raise LevelConfigError(f"{where}.stages: from_level must start at 1 and increase")
+        # Compile far enough for every stage to take effect; levels past that follow the last stage
+        rows = max(compiled_rows, starts[-1] + 1)
+
+        missing = [key for key in START_FIELDS + STAGE_FIELDS if key not in values and key not in stages[0]]
+        if missing:
+            raise LevelConfigError(f"{where}: no value for {', '.join(missing)}")
+
+        columns = {column: array.array(code, [0]) for column, code in COLUMNS}
+        speed = values["start_speed"]
+        stage_index = -1
+        for level in range(1, rows):
+            while stage_index + 1 < len(stages) and starts[stage_index + 1] <= level:
+                stage_index += 1
+                values.update((key, stages[stage_index][key]) for key in STAGE_FIELDS if key in stages[stage_index])
+                _check_values(values, f"{where}.stages[{stage_index}]", width)
+            columns["speed"].append(speed)
+            columns["points"].append(level * values["points_per_level"])
+            columns["chances_per_catch"].append(values["chances_per_catch"])
+            columns["spawn_margin"].append(values["spawn_margin"])
+            # Accumulate exactly as a run of catches would, level by level
+            speed += values["speed_step"]
+        tail = (float(values["speed_step"]), values["points_per_level"],
+                values["chances_per_catch"], values["spawn_margin"])
+        tables[name] = LevelTable(name, values["start_chances"], tail, columns)
+    return LevelSet(tables)
+
+
+def pack(level_set, source_hash):
+    tables = level_set.tables
+    parts = [HEADER.pack(MAGIC, VERSION, source_hash, len(tables))]
+    for name, table in tables.items():
+        encoded = name.encode()
+        rows = table.rows
+        parts.append(bytes([len(encoded)]) + encoded)
+        parts.append(TABLE_HEADER.pack(rows, table.start_chances, *table.tail))
+        for column, _ in COLUMNS:
+            values = array.array(getattr(table, column).typecode, getattr(table, column)[:rows])
+            if sys.byteorder == "big":
+                values.byteswap()
+            parts.append(values.tobytes())
+    body = b"".join(parts)
+    return body + CRC.pack(zlib.crc32(body))
+
+
+def unpack(data, source_hash):
+    """Return the cached LevelSet, or None if data is not a valid cache for source_hash."""
+    if len(data) < HEADER.size + CRC.size:
+        return None
+    body = data[:-CRC.size]
+    if CRC.unpack(data[-CRC.size:])[0] != zlib.crc32(body):
+        return None
+    magic, version, cached_hash, count = HEADER.unpack_from(body)
+    if magic != MAGIC or version != VERSION or cached_hash != source_hash:
+        return None
+
+    offset = HEADER.size
+    tables = {}
+    for _ in range(count):
+        length = body[offset]
+        name = body[offset + 1:offset + 1 + length].decode()
+        offset += 1 + length
+        rows, start_chances, *tail = TABLE_HEADER.unpack_from(body, offset)
+        offset += TABLE_HEADER.size
+        columns = {}
+        for column, code in COLUMNS:
+            values = array.array(code)
+            end = offset + values.itemsize * rows
+            values.frombytes(body[offset:end])
+            if sys.byteorder == "big":
+                values.byteswap()
+            columns[column] = values
+            offset = end
+        tables[name] = LevelTable(name, start_chances, tuple(tail), columns)
+    return LevelSet(tables, source_hash)
+
+
+def _write_cache(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".levels-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+_loaded = {}
+
+
+def load(source=DEFAULT_SOURCE, cache_dir=DEFAULT_CACHE_DIR, width=800):
+    """Return the compiled LevelSet for a levels file, from memory, the disk cache or a fresh compile.
+
+    The result is shared between callers. Tables only ever grow past the
+    compiled levels, and always with the same values, so sharing is safe.
+    """
+    st = os.stat(source)
+    memo_key = (source, st.st_mtime_ns, st.st_size, width)
+    cached = _loaded.get(memo_key)
+    if cached is None:
+        cached = _load_uncached(source, cache_dir, width)
+        _loaded.clear()
+        _loaded[memo_key] = cached
+    return cached
+
+
+def _load_uncached(source, cache_dir, width):
+    with open(source, "rb") as f:
+        data = f.read()
+    source_hash = hashlib.sha256(data + f"|width={width}".encode()).digest()
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, f"levels-{source_hash.hex()[:16]}.bclv")
+        try:
+            with open(cache_path, "rb") as f:
+                level_set = unpack(f.read(), source_hash)
+            if level_set is not None:
+                return level_set
+        except OSError:
+            pass
+
+    try:
+        config = json.loads(data)
+    except ValueError as exc:
+        raise LevelConfigError(f"{source}: {exc}") from None
+    level_set = compile_levels(config, width)
+    level_set.source_hash = source_hash
+    if cache_path is not None:
+        try:
+            _write_cache(cache_path, pack(level_set, source_hash))
+        except OSError:
+            # A read-only home directory only costs a recompile next time
+            pass
+    return level_set
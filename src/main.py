@@ -1,5 +1,97 @@
-from game import BallCatchGame
+import argparse
+
+from game import BallCatchGame, GameSettings
+from telemetry import parse_address
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ball Catch Game")
+    parser.add_argument(
+        "--telemetry",
+        metavar="ADDRESS",
+        help="publish live game state on a port, host:port or Unix socket path",
+    )
+    parser.add_argument(
+        "--analytics",
+        metavar="DIR",
+        help="log every ball drop to rotating files in DIR (see src/analytics_query.py)",
+    )
+    parser.add_argument(
+        "--analytics-max-files",
+        metavar="N",
+        type=int,
+        help="keep only the newest N analytics files, 0 for all (default 64)",
+    )
+    parser.add_argument(
+        "--threaded",
+        action="store_true",
+        help="run the game simulation on its own thread at a fixed rate",
+    )
+    parser.add_argument(
+        "--save-file",
+        metavar="PATH",
+        help="where to keep the suspended game (default ~/.ball_catch/session.bcs)",
+    )
+    parser.add_argument(
+        "--no-save",
+        action="store_true",
+        help="do not suspend games to disk",
+    )
+    parser.add_argument(
+        "--asset-stats",
+        action="store_true",
+        help="print asset cache hit rates on exit",
+    )
+    parser.add_argument(
+        "--capture",
+        metavar="PATH",
+        help="record gameplay to PATH (.gif for an animated GIF, anything else for raw rgb24 video)",
+    )
+    parser.add_argument(
+        "--capture-every",
+        metavar="N",
+        type=int,
+        default=1,
+        help="record every Nth frame (default 1)",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="ADDRESS",
+        help="serve Prometheus metrics over HTTP on a port or host:port (path /metrics)",
+    )
+    parser.add_argument(
+        "--submit",
+        metavar="URL",
+        help="send each finished game to a score verification server (see src/verify.py)",
+    )
+    args = parser.parse_args(argv)
+    if args.analytics_max_files is not None and args.analytics_max_files < 0:
+        parser.error("--analytics-max-files must be 0 or more")
+    return args
 
 
 if __name__ == "__main__":
-    BallCatchGame().run()
\ No newline at end of file
+    args = parse_args()
+    settings = GameSettings()
+    if args.telemetry:
+        settings.telemetry_address = parse_address(args.telemetry)
+    if args.analytics:
+        settings.analytics_dir = args.analytics
+    if args.analytics_max_files is not None:
+        settings.analytics_max_files = args.analytics_max_files or None
+    settings.threaded_simulation = args.threaded
+    if args.save_file:
+        settings.save_path = args.save_file
+    if args.no_save:
+        settings.save_path = None
+    settings.asset_stats = args.asset_stats
+    if args.capture:
+        settings.capture_path = args.capture
+        settings.capture_every = args.capture_every
+    if args.metrics:
+        settings.metrics_address = parse_address(args.metrics)
+        if isinstance(settings.metrics_address, str):
+            raise SystemExit("--metrics needs a port or host:port")
+    if args.submit:
+        settings.submit_url = args.submit
+    BallCatchGame(settings).run()
@@ -0,0 +1,145 @@
+"""
+Metrics - Prometheus-style counters for monitoring running game cabinets
+
+The game thread updates plain counters and histogram buckets in place: no
+locks, no allocation, just an integer add (or a bisect and an add). That is
+safe because each metric has a single writer, the game thread. An opt-in HTTP
+server on its own thread reads the current values when scraped and renders
+them in the Prometheus text format, so a scrape never waits on or interrupts
+the game loop. Values read mid-frame may be one update apart, which is fine
+for monitoring.
+
+    python src/main.py --metrics 9108
+    curl http://127.0.0.1:9108/metrics
+"""
+
+import bisect
+from http.server import BaseHTTPRequestHandler
+
+from httpserver import BackgroundHTTPServer
+
+
+DEFAULT_PORT = 9108
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LEVEL_BUCKETS = (1, 2, 3, 5, 8, 10, 15, 20, 30, 50, 100)
+FRAME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.015, 0.02, 0.025, 0.033, 0.05, 0.1, 0.25)
+
+
+def percentile(sorted_values, fraction):
+    """Value at fraction (0-1) of an already sorted list, 0.0 if it is empty."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class Counter:
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def render(self, lines):
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} counter")
+        lines.append(f"{self.name} {self.value}")
+
+
+class Histogram:
+    __slots__ = ("name", "help", "bounds", "counts", "sum")
+
+    def __init__(self, name, help_text, bounds):
+        self.name = name
+        self.help = help_text
+        self.bounds = tuple(bounds)
+        # One slot per bound plus +Inf; stored per bucket, made cumulative at scrape time
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def render(self, lines):
+        counts = list(self.counts)
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} histogram")
+        total = 0
+        for bound, count in zip(self.bounds, counts):
+            total += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {total}')
+        total += counts[-1]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {total}')
+        lines.append(f"{self.name}_sum {self.sum}")
+        lines.append(f"{self.name}_count {total}")
+
+
+class GameMetrics:
+    def __init__(self, states=(), state_source=None, audio_depth_source=None):
+        """Counters the game updates; state and audio depth are read from callables at scrape time."""
+        self.sessions_started = Counter("ballcatch_sessions_started_total", "Games started or resumed.")
+        self.games_over = Counter("ballcatch_games_over_total", "Games that ended with no chances left.")
+        self.catches = Counter("ballcatch_catches_total", "Balls caught.")
+        self.misses = Counter("ballcatch_misses_total", "Balls that hit the ground.")
+        self.level_reached = Histogram("ballcatch_level_reached", "Level reached when a game ended.",
+                                       LEVEL_BUCKETS)
+        self.frame_seconds = Histogram("ballcatch_frame_seconds", "Time spent on one game frame, excluding sleep.",
+                                       FRAME_BUCKETS)
+        self.states = tuple(states)
+        self.state_source = state_source
+        self.audio_depth_source = audio_depth_source
+
+    def drop(self, hit):
+        if hit:
+            self.catches.value += 1
+        else:
+            self.misses.value += 1
+
+    def game_over(self, level):
+        self.games_over.value += 1
+        self.level_reached.observe(level)
+
+    def render(self):
+        lines = []
+        if self.state_source is not None:
+            current = self.state_source()
+            lines.append("# HELP ballcatch_game_state Current game state (1 for the active state).")
+            lines.append("# TYPE ballcatch_game_state gauge")
+            for state in self.states:
+                lines.append(f'ballcatch_game_state{{state="{state.name}"}} {int(state is current)}')
+        for metric in (self.sessions_started, self.games_over, self.catches, self.misses,
+                       self.level_reached, self.frame_seconds):
+            metric.render(lines)
+        if self.audio_depth_source is not None:
+            lines.append("# HELP ballcatch_audio_queue_depth Sounds waiting to be played.")
+            lines.append("# TYPE ballcatch_audio_queue_depth gauge")
+            lines.append(f"ballcatch_audio_queue_depth {self.audio_depth_source()}")
+        return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer(BackgroundHTTPServer):
+    def __init__(self, metrics, address=("127.0.0.1", DEFAULT_PORT)):
+        """Serve metrics.render() over HTTP at a (host, port) address."""
+        super().__init__(_Handler, address, "metrics-http", metrics=metrics)
+        self.metrics = metrics
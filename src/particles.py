@@ -0,0 +1,140 @@
+"""
+Particles - budgeted particle bursts for catch and level-up effects
+
+Particles live in preallocated parallel arrays with a hard global cap. Live
+particles are kept packed at the front of the arrays, so update() is a single
+pass over exactly the live range. Canvas ovals are created once and recycled by
+hiding them; nothing is created or destroyed per frame.
+"""
+
+import array
+import math
+import random
+import time
+
+
+DEFAULT_CAPACITY = 1000
+FRAME_BUDGET = 0.012
+GRAVITY = 420.0
+PARTICLE_TAG = "particle"
+
+
+class ParticleSystem:
+    def __init__(self, canvas=None, capacity=DEFAULT_CAPACITY, frame_budget=FRAME_BUDGET, seed=None):
+        """canvas may be None to run the simulation without drawing (benchmarks, headless)."""
+        self.canvas = canvas
+        self.capacity = capacity
+        self.frame_budget = frame_budget
+        self.rng = random.Random(seed)
+
+        zeros = [0.0] * capacity
+        self.x = array.array("d", zeros)
+        self.y = array.array("d", zeros)
+        self.vx = array.array("d", zeros)
+        self.vy = array.array("d", zeros)
+        self.life = array.array("d", zeros)
+        self.max_life = array.array("d", zeros)
+        self.size = array.array("d", zeros)
+        self.items = [0] * capacity
+        self.live = 0
+
+        self._items_created = 0
+        self._frame_time = 0.0
+        self.dropped_emissions = 0
+
+    def _drawing(self):
+        # Once the window is closed, keep simulating but stop touching its canvas
+        canvas = self.canvas
+        if canvas is not None and getattr(canvas, "isClosed", None) is not None and canvas.isClosed():
+            self.canvas = canvas = None
+        return canvas
+
+    def over_budget(self):
+        return self._frame_time > self.frame_budget
+
+    def emit(self, x, y, count, color="yellow", speed=180.0, life=0.7, size=3.0):
+        """Start a burst of up to count particles; skipped entirely while over the frame budget."""
+        if self.over_budget():
+            self.dropped_emissions += 1
+            return 0
+        count = min(count, self.capacity - self.live)
+        canvas = self._drawing()
+        rng = self.rng
+        for _ in range(count):
+            i = self.live
+            angle = rng.uniform(0.0, 2.0 * math.pi)
+            velocity = speed * rng.uniform(0.4, 1.0)
+            self.x[i] = x
+            self.y[i] = y
+            self.vx[i] = math.cos(angle) * velocity
+            self.vy[i] = math.sin(angle) * velocity - speed * 0.5
+            self.life[i] = self.max_life[i] = life * rng.uniform(0.6, 1.0)
+            self.size[i] = size
+            if canvas is not None:
+                if i >= self._items_created:
+                    self.items[i] = canvas.create_oval(0, 0, 0, 0, width=0, tags=(PARTICLE_TAG,))
+                    self._items_created = i + 1
+                canvas.itemconfigure(self.items[i], fill=color, state="normal")
+            self.live += 1
+        if count and canvas is not None:
+            canvas.tag_raise(PARTICLE_TAG)
+        return count
+
+    def update(self, dt, frame_time=None):
+        """Advance and redraw every live particle in one pass.
+
+        frame_time is the caller's measured frame cost; without it, the cost of
+        this update is used to decide whether emission should be throttled.
+        """
+        started = time.perf_counter()
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        life, max_life, size, items = self.life, self.max_life, self.size, self.items
+        canvas = self._drawing()
+        coords = canvas.coords if canvas is not None else None
+        gravity = GRAVITY * dt
+
+        i = 0
+        while i < self.live:
+            remaining = life[i] - dt
+            if remaining <= 0.0:
+                self._kill(i)
+                continue
+            life[i] = remaining
+            vy[i] += gravity
+            px = x[i] + vx[i] * dt
+            py = y[i] + vy[i] * dt
+            x[i] = px
+            y[i] = py
+            if coords is not None:
+                r = size[i] * (0.3 + 0.7 * remaining / max_life[i])
+                coords(items[i], px - r, py - r, px + r, py + r)
+            i += 1
+
+        if frame_time is None:
+            frame_time = time.perf_counter() - started
+        # Smooth over a few frames so one slow frame does not cancel a burst.
+        self._frame_time = self._frame_time * 0.7 + frame_time * 0.3
+
+    def clear(self):
+        """Hide every live particle; the canvas items stay around for reuse."""
+        canvas = self._drawing()
+        if canvas is not None:
+            for i in range(self.live):
+                canvas.itemconfigure(self.items[i], state="hidden")
+        self.live = 0
+
+    def _kill(self, i):
+        # Swap the last live particle into slot i so the live range stays packed.
+        last = self.live - 1
+        if self.canvas is not None:
+            self.canvas.itemconfigure(self.items[i], state="hidden")
+        if i != last:
+            self.x[i] = self.x[last]
+            self.y[i] = self.y[last]
+            self.vx[i] = self.vx[last]
+            self.vy[i] = self.vy[last]
+            self.life[i] = self.life[last]
+            self.max_life[i] = self.max_life[last]
+            self.size[i] = self.size[last]
+            self.items[i], self.items[last] = self.items[last], self.items[i]
+        self.live = last
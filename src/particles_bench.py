@@ -0,0 +1,64 @@
+"""
+Particles Benchmark - frame time with a thousand live particles
+
+Keeps the particle system topped up to its cap and reports frame time
+percentiles. Draws on a Tk canvas when a display is available, otherwise runs
+the simulation only.
+
+Usage: python src/particles_bench.py [--particles 1000] [--frames 600] [--headless]
+"""
+
+import argparse
+import time
+
+from metrics import percentile
+from particles import ParticleSystem
+
+
+def open_canvas(width, height):
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None, None
+    canvas = tk.Canvas(root, width=width, height=height, background="lightblue")
+    canvas.pack()
+    root.update()
+    return root, canvas
+
+
+def run(particles, frames, headless, dt=1 / 60):
+    root, canvas = (None, None) if headless else open_canvas(800, 600)
+    # No budget here: the point is to measure a sustained full load.
+    system = ParticleSystem(canvas, capacity=particles, frame_budget=float("inf"), seed=1)
+
+    times = []
+    for frame in range(frames):
+        started = time.perf_counter()
+        if system.live < particles:
+            system.emit(400, 300, particles - system.live, color="gold", speed=260.0, life=1.5)
+        system.update(dt)
+        if root is not None:
+            root.update()
+        times.append(time.perf_counter() - started)
+
+    if root is not None:
+        root.destroy()
+
+    # Skip the warm-up frames where canvas items are still being created.
+    steady = sorted(times[min(60, frames // 10):])
+    mode = "canvas" if canvas is not None else "headless"
+    print(f"{particles} particles, {len(steady)} frames ({mode})")
+    for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        print(f"  {label}: {percentile(steady, fraction) * 1000:.3f} ms")
+    print(f"  max: {steady[-1] * 1000:.3f} ms")
+    print(f"  budget at 60 Hz: {1000 / 60:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Particle system frame time benchmark")
+    parser.add_argument("--particles", type=int, default=1000)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--headless", action="store_true", help="skip drawing even if a display is available")
+    args = parser.parse_args()
+    run(args.particles, args.frames, args.headless)
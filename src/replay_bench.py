@@ -0,0 +1,88 @@
+"""
+Replay Benchmark - fast-forward vs frame-stepped simulation of whole sessions
+
+Records sessions played by a bot with human-like key presses, then replays each input
+log from the same seed twice: once frame by frame and once with the closed-form
+fast-forward. Fails if the two ever end in a different state, and reports the
+cost per drop of each.
+
+Usage: python src/replay_bench.py [--sessions 200] [--skill 0.9] [--difficulty normal]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from levels import DIFFICULTIES
+from simulation import GameSimulation, InputLog
+
+
+def record_session(seed, difficulty, skill, max_frames=200000):
+    """Play one session with a bot and return (input log, drops played).
+
+    Like a person at the keyboard, the bot waits a reaction time after each
+    spawn, then holds a direction until it stands under where it thinks the
+    ball will land; the lower its skill, the wider its aim.
+    """
+    sim = GameSimulation(difficulty, seed=seed)
+    bot = random.Random(seed)
+    log = InputLog()
+    drops = 0
+    while not sim.session_over and log.frames < max_frames:
+        if sim.ball_x is None:
+            sim.spawn_ball()
+            drops += 1
+            wait = bot.randint(8, 20)
+            aim = sim.ball_x + bot.gauss(0, (1 - skill) * 150)
+        if wait > 0:
+            wait -= 1
+            move = 0
+        elif abs(aim - sim.player_x) >= 6:
+            move = 1 if aim > sim.player_x else -1
+        else:
+            move = 0
+        log.record(move)
+        sim.step(move)
+    return log, drops
+
+
+def replay(seed, difficulty, runs, fast):
+    sim = GameSimulation(difficulty, seed=seed)
+    started = time.perf_counter()
+    sim.replay(runs, fast=fast)
+    return sim, time.perf_counter() - started
+
+
+def run(sessions, difficulty, skill):
+    total_drops = 0
+    total_frames = 0
+    stepped_time = 0.0
+    fast_time = 0.0
+    mismatches = 0
+    for seed in range(sessions):
+        log, drops = record_session(seed, difficulty, skill)
+        stepped, t_stepped = replay(seed, difficulty, log.runs, fast=False)
+        fast, t_fast = replay(seed, difficulty, log.runs, fast=True)
+        if stepped.snapshot() != fast.snapshot() or stepped.last_drop != fast.last_drop:
+            mismatches += 1
+            print(f"seed {seed}: stepped {stepped.snapshot()} != fast {fast.snapshot()}")
+        total_drops += drops
+        total_frames += log.frames
+        stepped_time += t_stepped
+        fast_time += t_fast
+
+    print(f"{sessions} sessions, {total_drops} drops, {total_frames} frames ({difficulty}, skill {skill})")
+    print(f"  stepped: {stepped_time / total_drops * 1e6:8.1f} us/drop")
+    print(f"  fast:    {fast_time / total_drops * 1e6:8.1f} us/drop  ({stepped_time / fast_time:.0f}x)")
+    print(f"  mismatches: {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fast-forward replay benchmark")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--skill", type=float, default=0.9, help="bot accuracy from 0 (wild guesses) to 1 (always under the ball)")
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, default="normal")
+    args = parser.parse_args()
+    sys.exit(1 if run(args.sessions, args.difficulty, args.skill) else 0)
@@ -0,0 +1,113 @@
+"""
+Save State - compact suspend/resume snapshots of a game in progress
+
+A snapshot is one fixed-size little-endian record:
+    magic b"BCSS", uint16 version, then the SimSnapshot fields and the
+    difficulty, followed by a CRC32 of everything before it.
+
+Files are written to a temporary file, fsynced and renamed over the old one, so
+a crash or power cut leaves either the previous snapshot or the new one.
+Periodic autosaves skip the fsync to keep disk waits out of the frame loop, so
+a power cut right after one can lose that snapshot (it then fails its CRC and
+is ignored). Saves on pause, quit and window close are always fsynced.
+"""
+
+import os
+import struct
+import tempfile
+import zlib
+
+from levels import DIFFICULTIES
+from simulation import BALL_SPAWN_Y, SimSnapshot
+
+
+MAGIC = b"BCSS"
+VERSION = 1
+
+# magic, version, frame, level, chances, speed, score, missed_this_level,
+# has_ball, ball_x, ball_frames, player_x, difficulty
+RECORD = struct.Struct("<4sHQIIdQ??iIiB")
+CRC = struct.Struct("<I")
+SIZE = RECORD.size + CRC.size
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".ball_catch", "session.bcs")
+
+
+def pack(snapshot, difficulty):
+    has_ball = snapshot.ball_x is not None
+    body = RECORD.pack(
+        MAGIC,
+        VERSION,
+        snapshot.frame,
+        snapshot.level,
+        snapshot.chances,
+        snapshot.speed,
+        snapshot.score,
+        snapshot.missed_this_level,
+        has_ball,
+        snapshot.ball_x if has_ball else 0,
+        snapshot.ball_frames if has_ball else 0,
+        snapshot.player_x,
+        DIFFICULTIES.index(difficulty),
+    )
+    return body + CRC.pack(zlib.crc32(body))
+
+
+def unpack(data):
+    """Return (SimSnapshot, difficulty), or None if the data is not a valid current snapshot."""
+    if len(data) != SIZE:
+        return None
+    body = data[:RECORD.size]
+    if CRC.unpack(data[RECORD.size:])[0] != zlib.crc32(body):
+        return None
+    (magic, version, frame, level, chances, speed, score, missed,
+     has_ball, ball_x, ball_frames, player_x, difficulty) = RECORD.unpack(body)
+    if magic != MAGIC or version != VERSION or difficulty >= len(DIFFICULTIES):
+        return None
+
+    if not has_ball:
+        ball_x = None
+        ball_frames = 0
+    # ball_y and game_over are derived, not stored
+    ball_y = BALL_SPAWN_Y + ball_frames * speed if has_ball else None
+    snapshot = SimSnapshot(frame, level, chances, speed, score, missed, ball_x, ball_frames, ball_y, player_x, False)
+    return snapshot, DIFFICULTIES[difficulty]
+
+
+def save(path, snapshot, difficulty, durable=True):
+    """Atomically replace the snapshot at path; durable=False skips the fsync."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".session-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pack(snapshot, difficulty))
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load(path):
+    """Return (SimSnapshot, difficulty) from path, or None if there is no usable snapshot."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(SIZE + 1)
+    except OSError:
+        return None
+    return unpack(data)
+
+
+def exists(path):
+    return load(path) is not None
+
+
+def clear(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,407 @@
+"""
+Simulation - the ball catch rules, independent of any drawing
+
+GameSimulation holds everything play_game decides (ball, player, level,
+chances, speed, score) and advances one frame at a time. The Tk game renders
+from its snapshots; SimulationThread runs it at a fixed rate on its own thread
+so a slow redraw never delays the simulation or input.
+
+Headless runs can skip the frames entirely: replay() takes a run-length input
+log and resolves each drop in closed form (when the ball reaches the catch
+line, where the player is by then), with results identical to stepping.
+"""
+
+import collections
+import math
+import queue
+import random
+import sys
+import threading
+import time
+
+import levels
+
+# config/ lives at the repository root, next to src/. Other modules get the
+# settings as simulation.constant rather than importing config themselves, so
+# they do not depend on this path setup having run first.
+if levels.ROOT_DIR not in sys.path:
+    sys.path.append(levels.ROOT_DIR)
+from config import constant
+
+
+WIDTH = constant.WINDOW_WIDTH
+HEIGHT = constant.WINDOW_HEIGHT
+GROUND_Y = HEIGHT - constant.GROUND_HEIGHT
+BALL_SPAWN_Y = constant.BALL_SPAWN_Y
+PLAYER_HALF_WIDTH = constant.PLAYER_HALF_WIDTH
+PLAYER_HEIGHT = constant.PLAYER_HEIGHT
+PLAYER_TOP_Y = GROUND_Y - PLAYER_HEIGHT
+PLAYER_STEP = constant.PLAYER_SPEED
+CATCH_REACH = constant.CATCH_REACH
+
+FRAME_SECONDS = 0.02
+
+
+SimSnapshot = collections.namedtuple(
+    "SimSnapshot",
+    "frame level chances speed score missed_this_level ball_x ball_frames ball_y player_x game_over",
+)
+
+
+DropRecord = collections.namedtuple("DropRecord", "level speed spawn_x player_x hit perfect")
+
+
+class InputLog:
+    """Per-frame player moves (-1, 0 or 1), run-length encoded as [[move, frames], ...]."""
+
+    def __init__(self, runs=()):
+        self.runs = [[move, frames] for move, frames in runs]
+
+    @property
+    def frames(self):
+        return sum(frames for _, frames in self.runs)
+
+    def record(self, move):
+        move = (move > 0) - (move < 0)
+        runs = self.runs
+        if runs and runs[-1][0] == move:
+            runs[-1][1] += 1
+        else:
+            runs.append([move, 1])
+
+
+class GameSimulation:
+    def __init__(self, difficulty="normal", seed=None, width=WIDTH, height=HEIGHT, level_set=None):
+        self.difficulty = difficulty
+        self.rng = random.Random(seed)
+        self.width = width
+        self.height = height
+        # Progression for this difficulty, one row per level (see config/levels.json)
+        self.table = (level_set or levels.load(width=width)).table(difficulty)
+        self.ground_y = height - constant.GROUND_HEIGHT
+        self.catch_y = self.ground_y - PLAYER_HEIGHT - CATCH_REACH
+        self.reset()
+
+    def reset(self):
+        """Start a new session from level 1."""
+        self.frame = 0
+        self.level = 1
+        self.chances = self.table.start_chances
+        self.speed = self.table.start_speed
+        self.score = 0
+        self.missed_this_level = False
+        self.ball_x = None
+        self.ball_frames = 0
+        self.player_x = self.width // 2
+        self.game_over = False
+        self.last_drop = None
+
+    @property
+    def ball_y(self):
+        # Closed form rather than accumulating speed every frame, so any
+        # frame of a drop can be computed exactly without stepping to it.
+        return BALL_SPAWN_Y + self.ball_frames * self.speed
+
+    def spawn_ball(self):
+        """Drop a new ball; each drop consumes one chance."""
+        self.chances = max(0, self.chances - 1)
+        margin = self.table.spawn_margin[self.level]
+        self.ball_x = self.rng.randint(margin, self.width - margin)
+        self.ball_frames = 0
+        return self.ball_x
+
+    def move_player(self, direction):
+        """Move the player one step left (-1) or right (1), stopping at the window edges."""
+        if direction < 0 and self.player_x - PLAYER_HALF_WIDTH > 0:
+            self.player_x -= PLAYER_STEP
+        elif direction > 0 and self.player_x + PLAYER_HALF_WIDTH < self.width:
+            self.player_x += PLAYER_STEP
+
+    def player_covers(self, x):
+        return self.player_x - PLAYER_HALF_WIDTH <= x <= self.player_x + PLAYER_HALF_WIDTH
+
+    @property
+    def session_over(self):
+        # Same end condition as the serial game loop
+        return self.game_over or (self.ball_x is None and self.chances <= 0)
+
+    def step(self, move=0):
+        """Advance one frame: the ball falls, the player moves, then the drop is checked.
+
+        Returns "hit" or "miss" when the drop resolves this frame, otherwise None.
+        """
+        self.frame += 1
+        if self.ball_x is None:
+            if move:
+                self.move_player(move)
+            return None
+
+        self.ball_frames += 1
+        if move:
+            self.move_player(move)
+
+        ball_y = self.ball_y
+        if ball_y >= self.catch_y and self.player_covers(self.ball_x):
+            self._resolve(hit=True)
+            return "hit"
+        if ball_y > self.ground_y:
+            self._resolve(hit=False)
+            return "miss"
+        return None
+
+    def _resolve(self, hit):
+        perfect = hit and not self.missed_this_level
+        self.last_drop = DropRecord(self.level, self.speed, self.ball_x, self.player_x, hit, perfect)
+        self.ball_x = None
+        self.ball_frames = 0
+        if hit:
+            table = self.table
+            level = self.level
+            if level + 1 >= table.rows:
+                table.extend(level + 1)
+            self.score += table.points[level]
+            self.chances += table.chances_per_catch[level]
+            self.level = level + 1
+            self.speed = table.speed[level + 1]
+            self.missed_this_level = False
+        else:
+            self.missed_this_level = True
+            if self.chances <= 0:
+                self.game_over = True
+
+    def replay(self, runs, fast=True):
+        """Play run-length encoded moves [(move, frames), ...] the way the serial game loop does.
+
+        A new ball drops as soon as the last one resolves, until the session is
+        over or the inputs run out (possibly with a ball still in flight). With
+        fast=True each drop is resolved in closed form instead of frame by frame;
+        the end state is identical either way.
+        """
+        runs = [((move > 0) - (move < 0), frames) for move, frames in runs if frames > 0]
+        if not fast:
+            for move, frames in runs:
+                for _ in range(frames):
+                    if self.session_over:
+                        return
+                    if self.ball_x is None:
+                        self.spawn_ball()
+                    self.step(move)
+            return
+
+        index = used = 0
+        while index < len(runs) and not self.session_over:
+            if self.ball_x is None:
+                self.spawn_ball()
+            index, used = self._fast_drop(runs, index, used)
+
+    def _fast_drop(self, runs, index, used):
+        """Play the ball in flight from runs[index] (of which `used` frames are spent) until it resolves."""
+        if self.speed <= 0:
+            raise ValueError("fast-forward needs a positive ball speed")
+        ball_x = self.ball_x
+        f = self.ball_frames
+        first_catch = self._first_frame(self.catch_y, f, strict=False)
+        miss = self._first_frame(self.ground_y, f, strict=True)
+        x = self.player_x
+        played = 0
+        result = None
+        while index < len(runs):
+            move, frames = runs[index]
+            k = min(frames - used, miss - f)
+            j = self._first_cover(x, move, k, first_catch - f, ball_x)
+            if j is not None:
+                k = j
+                result = True
+            x = self._walk(x, move, k)
+            f += k
+            played += k
+            used += k
+            if used == frames:
+                index += 1
+                used = 0
+            if result is None and f == miss:
+                result = False
+            if result is not None:
+                break
+
+        self.frame += played
+        self.player_x = x
+        self.ball_frames = f
+        if result is not None:
+            self._resolve(hit=result)
+        return index, used
+
+    def _first_frame(self, threshold, after, strict):
+        """First ball frame past `after` whose y reaches threshold, using the exact comparison step() makes."""
+        speed = self.speed
+
+        def reached(n):
+            y = BALL_SPAWN_Y + n * speed
+            return y > threshold if strict else y >= threshold
+
+        n = max(after + 1, math.ceil((threshold - BALL_SPAWN_Y) / speed))
+        while n > after + 1 and reached(n - 1):
+            n -= 1
+        while not reached(n):
+            n += 1
+        return n
+
+    def _walk(self, x, move, frames):
+        """Player x after holding a move for some frames, stopping at the window edges like move_player()."""
+        if move < 0 and x - PLAYER_HALF_WIDTH > 0:
+            return x - PLAYER_STEP * min(frames, -((PLAYER_HALF_WIDTH - x) // PLAYER_STEP))
+        if move > 0 and x + PLAYER_HALF_WIDTH < self.width:
+            return x + PLAYER_STEP * min(frames, -((x + PLAYER_HALF_WIDTH - self.width) // PLAYER_STEP))
+        return x
+
+    def _first_cover(self, x, move, frames, earliest, ball_x):
+        """First frame (1..frames, not before earliest) of holding move from x on which the player covers ball_x."""
+        j = max(1, earliest)
+        if j > frames:
+            return None
+        # The player only moves one way within a run, so the first frame at
+        # which the near edge reaches the ball is the only candidate.
+        if move > 0:
+            gap = ball_x - PLAYER_HALF_WIDTH - x
+        elif move < 0:
+            gap = x - PLAYER_HALF_WIDTH - ball_x
+        else:
+            gap = 0
+        if gap > 0:
+            j = max(j, -(-gap // PLAYER_STEP))
+            if j > frames:
+                return None
+        x = self._walk(x, move, j)
+        return j if x - PLAYER_HALF_WIDTH <= ball_x <= x + PLAYER_HALF_WIDTH else None
+
+    def restore(self, snapshot):
+        """Continue a session from a SimSnapshot, including a ball already in flight."""
+        self.frame = snapshot.frame
+        self.level = snapshot.level
+        self.chances = snapshot.chances
+        self.speed = snapshot.speed
+        self.score = snapshot.score
+        self.missed_this_level = snapshot.missed_this_level
+        self.ball_x = snapshot.ball_x
+        self.ball_frames = snapshot.ball_frames if snapshot.ball_x is not None else 0
+        if snapshot.level >= self.table.rows:
+            self.table.extend(snapshot.level)
+        self.player_x = snapshot.player_x
+        self.game_over = snapshot.game_over
+        self.last_drop = None
+
+    def snapshot(self):
+        ball_y = self.ball_y if self.ball_x is not None else None
+        return SimSnapshot(
+            self.frame, self.level, self.chances, self.speed, self.score, self.missed_this_level,
+            self.ball_x, self.ball_frames, ball_y, self.player_x, self.game_over,
+        )
+
+
+class SimulationThread:
+    """Run a GameSimulation at a fixed rate and publish double-buffered snapshots.
+
+    The Tk thread sends moves and commands with send_input()/pause()/resume(),
+    reads the newest state with latest(), and drains drop events with events().
+    Both directions use queue.SimpleQueue, which never blocks the producer.
+    """
+
+    def __init__(self, sim, frame_seconds=FRAME_SECONDS, intermission=None):
+        self.sim = sim
+        self.frame_seconds = frame_seconds
+        # Frames between drops, standing in for the serial loop's effect pauses
+        self.intermission = intermission or {"hit": int(2.3 / frame_seconds), "miss": int(0.5 / frame_seconds)}
+
+        self._buffers = [sim.snapshot(), sim.snapshot()]
+        self._front = 0
+        self._inputs = queue.SimpleQueue()
+        self._events = queue.SimpleQueue()
+        self._thread = None
+        self._running = False
+        self._paused = False
+        self._wait = 0
+        self.late_frames = 0
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def send_input(self, move):
+        self._inputs.put(move)
+
+    def pause(self):
+        self._inputs.put("pause")
+
+    def resume(self):
+        self._inputs.put("resume")
+
+    def latest(self):
+        """Return the most recently completed snapshot."""
+        return self._buffers[self._front]
+
+    def events(self):
+        """Drain and return every event published since the last call."""
+        drained = []
+        while True:
+            try:
+                drained.append(self._events.get_nowait())
+            except queue.Empty:
+                return drained
+
+    def _run(self):
+        next_frame = time.perf_counter()
+        while self._running and not self.sim.game_over:
+            self._tick()
+            next_frame += self.frame_seconds
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -self.frame_seconds * 10:
+                # Far behind (e.g. the process was suspended): skip ahead instead of bursting.
+                self.late_frames += 1
+                next_frame = time.perf_counter()
+
+    def _tick(self):
+        moves = []
+        while True:
+            try:
+                item = self._inputs.get_nowait()
+            except queue.Empty:
+                break
+            if item == "pause":
+                self._paused = True
+            elif item == "resume":
+                self._paused = False
+            else:
+                moves.append(item)
+        if self._paused:
+            return
+
+        sim = self.sim
+        # Every key press is one step, however many arrived since the last frame.
+        for move in moves:
+            sim.move_player(move)
+        if sim.ball_x is None:
+            if self._wait > 0:
+                self._wait -= 1
+                sim.step()
+            else:
+                self._events.put(("spawn", sim.spawn_ball()))
+        else:
+            result = sim.step()
+            if result is not None:
+                self._wait = self.intermission[result]
+                self._events.put((result, sim.last_drop))
+                if sim.game_over:
+                    self._events.put(("game_over", None))
+
+        back = 1 - self._front
+        self._buffers[back] = sim.snapshot()
+        self._front = back
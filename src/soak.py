@@ -0,0 +1,194 @@
+"""
+Soak Test - play thousands of levels as fast as possible and watch for growth
+
+A scripted perfect-catch player drives the real BallCatchGame (window, effects,
+particles and all) with frame sleeps and effect pauses turned off. At regular
+intervals it samples process RSS, tracemalloc totals, live canvas items and
+frame-time percentiles, and fails if any of them trends upward.
+
+tracemalloc slows every allocation, so absolute frame times are higher than
+in normal play; use --no-tracemalloc when the frame times themselves matter.
+
+Needs a display for Tk; on a headless machine run it under xvfb-run:
+    xvfb-run python src/soak.py --levels 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from game import BallCatchGame, GameSettings, GameState
+from metrics import percentile
+from simulation import PLAYER_HALF_WIDTH
+
+
+# Allowed growth from the start to the end of the run, as (relative, absolute)
+TOLERANCES = {
+    "rss_kb": (0.10, 4096),
+    "traced_kb": (0.10, 512),
+    "window_items": (0.0, 0),
+    "canvas_items": (0.0, 0),
+    "frame_p50_ms": (0.50, 0.5),
+    "frame_p99_ms": (1.00, 2.0),
+}
+
+# Fewest samples after warm-up that a trend can be judged from
+MIN_SAMPLES = 3
+
+
+def read_rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def slope_growth(values):
+    """Growth across the series from a least-squares fit, so one noisy sample cannot fail a run."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    num = sum((i - mean_x) * (v - mean_y) for i, v in enumerate(values))
+    den = sum((i - mean_x) ** 2 for i in range(n))
+    return num / den * (n - 1)
+
+
+class SoakGame(BallCatchGame):
+    def __init__(self, target_level, sample_every, on_sample):
+        settings = GameSettings()
+        settings.sound_enabled = False
+        settings.music_enabled = False
+        settings.save_path = None
+        super().__init__(settings)
+        self.frame_delay = 0
+        self.effect_time_scale = 0
+
+        self.target_level = target_level
+        self.sample_every = sample_every
+        self.on_sample = on_sample
+        self.frame_times = []
+        self._last_poll = None
+        self._next_sample = sample_every
+
+    def safe_get_key(self):
+        # "Press any key to start!"
+        return "Return"
+
+    def create_new_ball(self, x=None):
+        super().create_new_ball(x)
+        # The scripted player is always standing under the ball.
+        self.sim.player_x = min(max(self.sim.ball_x, PLAYER_HALF_WIDTH), self.width - PLAYER_HALF_WIDTH)
+
+    def poll_key(self):
+        now = time.perf_counter()
+        if self._last_poll is not None:
+            self.frame_times.append(now - self._last_poll)
+        self._last_poll = now
+
+        if self.level >= self._next_sample:
+            self._next_sample += self.sample_every
+            self.on_sample(self)
+            self.frame_times = []
+            self._last_poll = time.perf_counter()
+        if self.level >= self.target_level:
+            return "q"
+        return ""
+
+
+class SoakRun:
+    def __init__(self, levels, sample_every, warmup, trace_memory=True):
+        self.levels = levels
+        self.sample_every = sample_every
+        self.warmup = warmup
+        self.trace_memory = trace_memory
+        self.samples = []
+
+    def sample(self, game):
+        times = sorted(game.frame_times)
+        traced = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        row = {
+            "level": game.level,
+            "rss_kb": read_rss_kb(),
+            "traced_kb": traced // 1024,
+            "window_items": len(game.window.items),
+            "canvas_items": len(game.window.find_all()),
+            "frame_p50_ms": percentile(times, 0.50) * 1000,
+            "frame_p99_ms": percentile(times, 0.99) * 1000,
+        }
+        self.samples.append(row)
+        print(
+            f"level {row['level']:>6}  rss {row['rss_kb']:>8} KB  traced {row['traced_kb']:>6} KB  "
+            f"items {row['window_items']:>3}/{row['canvas_items']:>4}  "
+            f"frame p50 {row['frame_p50_ms']:.3f} ms  p99 {row['frame_p99_ms']:.3f} ms",
+            flush=True,
+        )
+
+    def run(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        game = SoakGame(self.levels, self.sample_every, self.sample)
+        game.create_window()
+        game.state = GameState.PLAYING
+        started = time.perf_counter()
+        try:
+            game.play_game()
+        finally:
+            if game.window is not None:
+                game.window.close()
+            if self.trace_memory:
+                tracemalloc.stop()
+        elapsed = time.perf_counter() - started
+        print(f"{game.level - 1} levels in {elapsed:.1f}s")
+        return self.check()
+
+    def check(self):
+        """Return the list of metrics that grew beyond their tolerance."""
+        steady = self.samples[self.warmup:]
+        if len(steady) < MIN_SAMPLES:
+            print(f"Only {len(steady)} samples after warm-up, need {MIN_SAMPLES} to judge trends")
+            return ["too_few_samples"]
+        failures = []
+        for metric, (relative, absolute) in TOLERANCES.items():
+            values = [row[metric] for row in steady]
+            growth = slope_growth(values)
+            allowed = max(absolute, relative * values[0])
+            status = "ok"
+            if growth > allowed:
+                status = "GROWING"
+                failures.append(metric)
+            print(f"  {metric:<14} start {values[0]:>10.2f}  growth {growth:>+10.2f}  allowed {allowed:>9.2f}  {status}")
+        return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ball Catch long-session soak test")
+    parser.add_argument("--levels", type=int, default=3000)
+    parser.add_argument("--sample-every", type=int, default=100, help="levels between samples")
+    parser.add_argument("--warmup", type=int, default=2, help="samples to ignore while caches fill")
+    parser.add_argument("--no-tracemalloc", action="store_true",
+                        help="skip Python allocation tracking for undistorted frame times")
+    args = parser.parse_args(argv)
+    if args.sample_every < 1 or args.warmup < 0:
+        parser.error("--sample-every must be at least 1 and --warmup at least 0")
+    # One sample is taken every --sample-every levels
+    if args.levels // args.sample_every - args.warmup < MIN_SAMPLES:
+        parser.error(f"--levels {args.levels} gives only {args.levels // args.sample_every} samples; "
+                     f"need --warmup {args.warmup} plus {MIN_SAMPLES} to judge trends")
+
+    failures = SoakRun(args.levels, args.sample_every, args.warmup, not args.no_tracemalloc).run()
+    if failures:
+        print("FAIL: " + ", ".join(failures))
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+Telemetry - live game state stream for spectator/monitoring views
+
+The game calls publish() once per frame with a small state dict. Each frame is
+encoded once as a delta against the previous frame and handed to every
+subscriber's bounded queue; a background thread does all the socket work, so a
+slow or stuck viewer can never stall the game loop.
+
+Wire format is newline-delimited JSON:
+    {"t": "k", "seq": 12, "s": {...full state...}}   keyframe
+    {"t": "d", "seq": 13, "s": {...changed keys...}}  delta against seq - 1
+"""
+
+import collections
+import json
+import os
+import selectors
+import socket
+import threading
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def parse_address(value):
+    """Turn a CLI value into a socket address: a port, host:port or a Unix socket path."""
+    value = str(value)
+    if value.isdigit():
+        return (DEFAULT_HOST, int(value))
+    if ":" in value and os.sep not in value:
+        host, port = value.rsplit(":", 1)
+        return (host or DEFAULT_HOST, int(port))
+    return value
+
+
+def encode_frame(kind, seq, state):
+    return (json.dumps({"t": kind, "seq": seq, "s": state}, separators=(",", ":")) + "\n").encode()
+
+
+class _Subscriber:
+    def __init__(self, sock, queue_size):
+        self.sock = sock
+        self.queue = collections.deque(maxlen=queue_size)
+        self.out = b""
+        self.needs_keyframe = True
+        self.last_seq = -1
+
+
+class TelemetryPublisher:
+    def __init__(self, address=(DEFAULT_HOST, DEFAULT_PORT), queue_size=120):
+        """Create a publisher on a (host, port) tuple or a Unix socket path."""
+        self.address = address
+        self.queue_size = queue_size
+        self._frame = (0, {})
+        self._subscribers = []
+        self._listener = None
+        self._wake_r = None
+        self._wake_w = None
+        self._wake_pending = False
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        """Open the listening socket and start the sender thread."""
+        if isinstance(self.address, tuple):
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        else:
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.address)
+        listener.listen(16)
+        listener.setblocking(False)
+        self._listener = listener
+        if isinstance(self.address, tuple):
+            self.address = listener.getsockname()[:2]
+
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the sender thread and close every socket."""
+        if not self._running:
+            return
+        self._running = False
+        self._wake()
+        self._thread.join(timeout=1.0)
+        for sub in list(self._subscribers):
+            sub.sock.close()
+        self._subscribers = []
+        self._listener.close()
+        self._wake_r.close()
+        self._wake_w.close()
+        if not isinstance(self.address, tuple) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def publish(self, state):
+        """Record a new frame of game state. Cheap enough to call every frame."""
+        seq, previous = self._frame
+        delta = {key: value for key, value in state.items() if previous.get(key) != value}
+        for key in previous:
+            if key not in state:
+                delta[key] = None
+        if not delta:
+            return
+
+        seq += 1
+        # Swap in a fresh tuple so the sender thread can read a consistent keyframe.
+        self._frame = (seq, dict(state))
+        if not self._subscribers:
+            return
+
+        item = (seq, encode_frame("d", seq, delta))
+        for sub in self._subscribers:
+            if len(sub.queue) == sub.queue.maxlen:
+                # The oldest delta is about to be dropped, so the viewer needs a keyframe.
+                sub.needs_keyframe = True
+            sub.queue.append(item)
+        self._wake()
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def _wake(self):
+        if self._wake_pending:
+            return
+        self._wake_pending = True
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def _serve(self):
+        sel = selectors.DefaultSelector()
+        sel.register(self._listener, selectors.EVENT_READ, "listen")
+        sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+
+        while self._running:
+            for key, mask in sel.select(timeout=0.5):
+                if key.data == "listen":
+                    self._accept(sel)
+                elif key.data == "wake":
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                    # Clear only after draining: a publish() in between would
+                    # otherwise have its byte swallowed and leave the flag stuck
+                    self._wake_pending = False
+                elif mask & selectors.EVENT_READ:
+                    try:
+                        data = key.fileobj.recv(4096)
+                    except (BlockingIOError, InterruptedError):
+                        continue
+                    except OSError:
+                        data = b""
+                    if not data:
+                        self._drop(sel, key.data)
+
+            for sub in list(self._subscribers):
+                self._flush(sel, sub)
+
+        sel.close()
+
+    def _accept(self, sel):
+        try:
+            sock, _ = self._listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setblocking(False)
+        if sock.family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sub = _Subscriber(sock, self.queue_size)
+        sel.register(sock, selectors.EVENT_READ, sub)
+        # Copy-on-write so publish() never sees the list change under it.
+        self._subscribers = self._subscribers + [sub]
+
+    def _drop(self, sel, sub):
+        try:
+            sel.unregister(sub.sock)
+        except (KeyError, ValueError):
+            pass
+        sub.sock.close()
+        self._subscribers = [s for s in self._subscribers if s is not sub]
+
+    def _flush(self, sel, sub):
+        if not sub.out:
+            if sub.needs_keyframe:
+                sub.needs_keyframe = False
+                sub.queue.clear()
+                seq, state = self._frame
+                sub.out = encode_frame("k", seq, state)
+                sub.last_seq = seq
+            else:
+                chunks = []
+                while sub.queue:
+                    seq, payload = sub.queue.popleft()
+                    if seq > sub.last_seq:
+                        chunks.append(payload)
+                        sub.last_seq = seq
+                sub.out = b"".join(chunks)
+
+        if not sub.out:
+            return
+        try:
+            sent = sub.sock.send(sub.out)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._drop(sel, sub)
+            return
+        sub.out = sub.out[sent:]
+
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if sub.out else 0)
+        try:
+            sel.modify(sub.sock, events, sub)
+        except (KeyError, ValueError):
+            pass
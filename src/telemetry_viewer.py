@@ -0,0 +1,68 @@
+"""
+Telemetry Viewer - console client for the live game state stream
+
+Usage: python src/telemetry_viewer.py [PORT | HOST:PORT | SOCKET_PATH]
+"""
+
+import json
+import socket
+import sys
+
+from telemetry import DEFAULT_PORT, parse_address
+
+
+class TelemetryViewer:
+    def __init__(self, address):
+        self.address = address
+        self.state = {}
+        self.seq = 0
+        self.frames = 0
+        self.keyframes = 0
+
+    def connect(self):
+        if isinstance(self.address, tuple):
+            return socket.create_connection(self.address)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.address)
+        return sock
+
+    def apply(self, message):
+        """Apply one keyframe or delta message to the local copy of the state."""
+        if message["t"] == "k":
+            self.state = dict(message["s"])
+            self.keyframes += 1
+        else:
+            self.state.update(message["s"])
+        self.seq = message["seq"]
+        self.frames += 1
+
+    def render(self):
+        s = self.state
+        ball = s.get("ball")
+        ball_text = f"({ball[0]:.0f}, {ball[1]:.0f})" if ball else "-"
+        player = s.get("player")
+        player_text = f"{player[0]:.0f}-{player[2]:.0f}" if player else "-"
+        line = (
+            f"[{s.get('state', '?'):<12}] Level: {s.get('level', 0):<4} "
+            f"Chances: {s.get('chances', 0):<4} Score: {s.get('score', 0):<6} "
+            f"Speed: {s.get('speed', 0):.1f}  Ball: {ball_text:<12} Player: {player_text:<9} "
+            f"seq={self.seq}"
+        )
+        sys.stdout.write("\r" + line)
+        sys.stdout.flush()
+
+    def run(self):
+        with self.connect() as sock:
+            reader = sock.makefile("rb")
+            for raw in reader:
+                self.apply(json.loads(raw))
+                self.render()
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PORT
+    try:
+        TelemetryViewer(parse_address(target)).run()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,287 @@
+"""
+Verify - server-side score verification by re-simulating submitted runs
+
+A finished game is submitted as its seed, difficulty and run-length input log
+together with the claimed score, level and chances. The service replays the
+inputs headlessly with GameSimulation's fast-forward, which follows the same
+rules as the serial game loop, and accepts the claim only if the replay ends
+in exactly that state.
+
+Replays run in a process pool, and each worker parses its own request body,
+so the HTTP process only moves bytes around. At most --queue submissions are
+in flight (running or waiting). Past that the server answers 503 at once
+instead of letting a backlog build up.
+
+Usage:
+    python src/verify.py [--port 8767] [--workers N] [--queue 256]
+    curl --data @run.json http://127.0.0.1:8767/verify
+    python src/verify_loadtest.py                # load test against a local server
+
+Submission (JSON):
+    {"seed": 123, "difficulty": "normal", "rules": "<levels hash>",
+     "inputs": [[0, 14], [1, 52], ...], "score": 60, "level": 4, "chances": 0}
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler
+
+import levels
+from httpserver import BackgroundHTTPServer
+from simulation import GameSimulation
+
+
+DEFAULT_PORT = 8767
+DEFAULT_QUEUE = 256
+RESULT_TIMEOUT = 10.0
+
+MAX_BODY_BYTES = 4 * 1024 * 1024
+MAX_FRAMES = 50 * 60 * 60 * 24   # a day of play at 50 frames per second
+CLAIMS = ("score", "level", "chances")
+
+
+def make_submission(seed, difficulty, runs, score, level, chances):
+    """Build the JSON-ready record of a finished run for submission."""
+    return {
+        "seed": seed,
+        "difficulty": difficulty,
+        "rules": levels.load().source_hash.hex(),
+        "inputs": [list(run) for run in runs],
+        "score": score,
+        "level": level,
+        "chances": chances,
+    }
+
+
+def _int(value, name, minimum=0):
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise ValueError(f"{name} must be an integer >= {minimum}")
+    return value
+
+
+def parse_submission(body):
+    """Decode and check a submission; raises ValueError if it is malformed."""
+    try:
+        data = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("body is not valid JSON") from None
+    if not isinstance(data, dict):
+        raise ValueError("submission must be a JSON object")
+    _int(data.get("seed"), "seed")
+    for claim in CLAIMS:
+        _int(data.get(claim), claim)
+    if not isinstance(data.get("difficulty"), str):
+        raise ValueError("difficulty must be a string")
+    if not isinstance(data.get("rules"), str):
+        raise ValueError("rules must be the hash of the level rules the run was played with")
+    inputs = data.get("inputs")
+    if not isinstance(inputs, list):
+        raise ValueError("inputs must be a list of [move, frames] pairs")
+    frames = 0
+    for run in inputs:
+        if (not isinstance(run, list) or len(run) != 2 or run[0] not in (-1, 0, 1)
+                or isinstance(run[1], bool) or not isinstance(run[1], int) or run[1] < 1):
+            raise ValueError("inputs must be a list of [move, frames] pairs with move -1, 0 or 1")
+        frames += run[1]
+    if frames > MAX_FRAMES:
+        raise ValueError(f"run is longer than {MAX_FRAMES} frames")
+    return data
+
+
+def verify(body):
+    """Replay one submission (raw JSON bytes) and return the verdict as a dict."""
+    try:
+        data = parse_submission(body)
+    except ValueError as exc:
+        return {"valid": False, "reason": str(exc)}
+
+    level_set = levels.load()
+    if data["rules"] != level_set.source_hash.hex():
+        return {"valid": False, "reason": "run was played with different level rules"}
+    if data["difficulty"] not in level_set.tables:
+        return {"valid": False, "reason": f"unknown difficulty {data['difficulty']!r}"}
+
+    sim = GameSimulation(data["difficulty"], seed=data["seed"], level_set=level_set)
+    sim.replay(data["inputs"])
+    replayed = {
+        "score": sim.score,
+        "level": sim.level,
+        "chances": sim.chances,
+        "finished": sim.session_over,
+        "frames": sim.frame,
+    }
+    mismatched = [claim for claim in CLAIMS if data[claim] != replayed[claim]]
+    if mismatched:
+        reason = "claimed " + ", ".join(f"{claim} {data[claim]} but replay gives {replayed[claim]}"
+                                        for claim in mismatched)
+        return {"valid": False, "reason": reason, "replayed": replayed}
+    return {"valid": True, "reason": "ok", "replayed": replayed}
+
+
+def _init_worker():
+    # Compile (or read the cached) level tables once per worker, not per request
+    levels.load()
+
+
+class VerificationService:
+    def __init__(self, workers=None, max_pending=DEFAULT_QUEUE):
+        """Process pool that accepts at most max_pending submissions at a time."""
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool = None
+        self._lock = threading.Lock()
+        self.counts = {"valid": 0, "invalid": 0, "rejected_busy": 0, "timeouts": 0, "errors": 0}
+
+    def start(self):
+        self._pool = concurrent.futures.ProcessPoolExecutor(self.workers, initializer=_init_worker)
+        # Start every worker now rather than on the first requests
+        list(self._pool.map(abs, range(self.workers)))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def submit(self, body):
+        """Return a future for the verdict, or None if the queue is full."""
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected_busy")
+            return None
+        try:
+            future = self._pool.submit(verify, body)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        self._slots.release()
+        if not future.cancelled() and future.exception() is None:
+            self._count("valid" if future.result()["valid"] else "invalid")
+
+    def verify(self, body, timeout=RESULT_TIMEOUT):
+        """Verdict for a submission, or None if the service is too busy to take it."""
+        future = self.submit(body)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            self._count("timeouts")
+            raise
+        except Exception:
+            self._count("errors")
+            raise
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counts)
+        stats["workers"] = self.workers
+        stats["max_pending"] = self.max_pending
+        return stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, payload, headers=()):
+        body = (json.dumps(payload, separators=(",", ":")) + "\n").encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._reply(200, self.server.service.stats())
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/verify":
+            self._reply(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self._reply(411, {"error": "Content-Length required"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._reply(413, {"error": f"submission larger than {MAX_BODY_BYTES} bytes"})
+            return
+        body = self.rfile.read(length)
+        try:
+            result = self.server.service.verify(body)
+        except concurrent.futures.TimeoutError:
+            self._reply(504, {"error": "verification timed out"})
+            return
+        except Exception as exc:
+            # A replay that crashed (or a broken worker pool) still gets an answer
+            self._reply(500, {"error": f"verification failed: {type(exc).__name__}"})
+            return
+        if result is None:
+            self._reply(503, {"error": "verification queue is full"}, [("Retry-After", "1")])
+            return
+        self._reply(200, result)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class VerifyServer(BackgroundHTTPServer):
+    def __init__(self, service, address=("127.0.0.1", DEFAULT_PORT)):
+        """Serve a VerificationService over HTTP at a (host, port) address."""
+        # Bursts of connections arrive faster than the default backlog of 5 drains
+        super().__init__(_Handler, address, "verify-http", backlog=1024, service=service)
+        self.service = service
+
+
+def submit_run(url, submission, timeout=RESULT_TIMEOUT):
+    """POST a submission to a verification server and return its verdict."""
+    request = urllib.request.Request(
+        url.rstrip("/") + "/verify",
+        data=json.dumps(submission, separators=(",", ":")).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ball Catch score verification server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="replay processes (default: one per CPU)")
+    parser.add_argument("--queue", type=int, default=DEFAULT_QUEUE, help="most submissions in flight at once")
+    args = parser.parse_args(argv)
+
+    service = VerificationService(args.workers, args.queue)
+    service.start()
+    server = VerifyServer(service, (args.host, args.port))
+    server.start()
+    print(f"Verifying runs on http://{args.host}:{server.port}/verify with {service.workers} workers")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
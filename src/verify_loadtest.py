@@ -0,0 +1,155 @@
+"""
+Verify Load Test - throughput and correctness of the score verification server
+
+Records a set of bot-played sessions, works out their true final state by
+stepping every frame, then sends them to a verification server from many
+concurrent clients. A share of the submissions claim an inflated score. The
+test checks every verdict (honest runs accepted, tampered runs rejected) and
+reports verifications per second and latency percentiles.
+
+Starts its own server unless --url is given.
+
+Usage: python src/verify_loadtest.py [--submissions 3000] [--concurrency 32] [--workers N] [--url URL]
+"""
+
+import argparse
+import concurrent.futures
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+import urllib.parse
+
+from levels import DIFFICULTIES
+from metrics import percentile
+from replay_bench import record_session
+from simulation import GameSimulation
+from verify import VerificationService, VerifyServer, make_submission
+
+
+def build_submissions(sessions, difficulty, skill, tamper, seed=1):
+    """Return a list of (JSON body, expected verdict)."""
+    rng = random.Random(seed)
+    submissions = []
+    for session_seed in range(seed * 100000, seed * 100000 + sessions):
+        log, _ = record_session(session_seed, difficulty, skill)
+        truth = GameSimulation(difficulty, seed=session_seed)
+        truth.replay(log.runs, fast=False)
+        score = truth.score
+        honest = rng.random() >= tamper
+        if not honest:
+            score += 10 * rng.randint(1, 20)
+        submission = make_submission(session_seed, difficulty, log.runs, score, truth.level, truth.chances)
+        submissions.append((json.dumps(submission, separators=(",", ":")).encode(), honest))
+    return submissions
+
+
+class Client:
+    """One keep-alive connection per load-test thread."""
+
+    _local = threading.local()
+
+    def __init__(self, url):
+        parts = urllib.parse.urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = parts.path.rstrip("/") + "/verify"
+
+    def post(self, body):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            connection.request("POST", self.path, body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            raise
+
+
+def run(url, submissions, total, concurrency):
+    client = Client(url)
+    latencies = []
+    statuses = {}
+    wrong = 0
+    errors = 0
+    lock = threading.Lock()
+
+    def send(i):
+        nonlocal wrong, errors
+        body, honest = submissions[i % len(submissions)]
+        started = time.perf_counter()
+        try:
+            status, verdict = client.post(body)
+        except (OSError, http.client.HTTPException):
+            with lock:
+                errors += 1
+            return
+        elapsed = time.perf_counter() - started
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(elapsed)
+                if verdict["valid"] != honest:
+                    wrong += 1
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(send, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    verified = len(latencies)
+    print(f"{total} submissions from {concurrency} clients in {elapsed:.2f}s")
+    print(f"  verified: {verified} ({verified / elapsed:.0f}/s)")
+    print("  statuses: " + ", ".join(f"{status} x{count}" for status, count in sorted(statuses.items())))
+    if latencies:
+        for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            print(f"  {label}: {percentile(latencies, fraction) * 1000:.1f} ms")
+    print(f"  wrong verdicts: {wrong}, connection errors: {errors}")
+    return wrong == 0 and errors == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the score verification server")
+    parser.add_argument("--url", help="server to test (default: start one in this process)")
+    parser.add_argument("--submissions", type=int, default=3000)
+    parser.add_argument("--sessions", type=int, default=200, help="distinct recorded sessions to cycle through")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--tamper", type=float, default=0.2, help="share of submissions with an inflated score")
+    parser.add_argument("--skill", type=float, default=0.7, help="recording bot accuracy (higher = longer runs)")
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, default="normal")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--queue", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    print(f"Recording {args.sessions} sessions...", flush=True)
+    submissions = build_submissions(args.sessions, args.difficulty, args.skill, args.tamper)
+    average = sum(len(body) for body, _ in submissions) / len(submissions)
+    print(f"  average submission {average / 1024:.1f} KB")
+
+    service = server = None
+    url = args.url
+    if url is None:
+        service = VerificationService(args.workers, args.queue)
+        service.start()
+        server = VerifyServer(service, ("127.0.0.1", 0))
+        server.start()
+        url = f"http://127.0.0.1:{server.port}"
+        print(f"Started a local server with {service.workers} workers")
+    try:
+        ok = run(url, submissions, args.submissions, args.concurrency)
+    finally:
+        if server is not None:
+            server.stop()
+            service.close()
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+Versus Mode - server-authoritative multiplayer ball catching
+
+The server runs every match simulation itself at a fixed tick rate. Clients
+only send their movement inputs (batched, with sequence numbers) and render the
+state the server broadcasts back; see versus_client.py for the prediction side.
+
+Usage:
+    python src/versus.py serve [--port 8766] [--players 2]
+    python src/versus.py demo [--matches 4] [--players 2]   # loopback bots
+"""
+
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import random
+
+import levels
+from simulation import (
+    BALL_SPAWN_Y, CATCH_REACH, GROUND_Y, PLAYER_HALF_WIDTH, PLAYER_STEP, PLAYER_TOP_Y, WIDTH,
+)
+
+
+DEFAULT_PORT = 8766
+TICK_RATE = 60
+SNAPSHOT_INTERVAL = 2
+MAX_QUEUED_INPUTS = TICK_RATE
+
+
+def apply_move(x, move):
+    """Move a player centre one tick left (-1) or right (1), same rule as the single-player game."""
+    if move < 0 and x - PLAYER_HALF_WIDTH > 0:
+        return x - PLAYER_STEP
+    if move > 0 and x + PLAYER_HALF_WIDTH < WIDTH:
+        return x + PLAYER_STEP
+    return x
+
+
+def valid_input(entry):
+    """True for a well-formed [seq, move] pair: integer seq, move -1, 0 or 1."""
+    return (
+        isinstance(entry, list) and len(entry) == 2
+        and type(entry[0]) is int and type(entry[1]) is int and entry[1] in (-1, 0, 1)
+    )
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class VersusMatch:
+    def __init__(self, match_id, player_ids, seed=None, drops=20, difficulty="normal", intermission=30, level_set=None):
+        """Pure match simulation: one shared ball, whoever catches it scores.
+
+        Speed, points and spawn margin per level come from config/levels.json.
+        """
+        self.match_id = match_id
+        self.rng = random.Random(seed)
+        self.drops_left = drops
+        self.table = (level_set or levels.load(width=WIDTH)).table(difficulty)
+        self.intermission = intermission
+
+        self.tick = 0
+        self.level = 1
+        self.speed = self.table.start_speed
+        self.ball_x = None
+        self.ball_frames = 0
+        self.wait = intermission
+
+        spacing = WIDTH / (len(player_ids) + 1)
+        self.players = {
+            pid: {"x": round(spacing * (i + 1)), "score": 0, "ack": 0}
+            for i, pid in enumerate(player_ids)
+        }
+
+    @property
+    def ball_y(self):
+        return BALL_SPAWN_Y + self.ball_frames * self.speed
+
+    @property
+    def finished(self):
+        return self.drops_left <= 0 and self.ball_x is None
+
+    def step(self, moves):
+        """Advance one tick using {player_id: (seq, move)} and return a list of events."""
+        self.tick += 1
+        events = []
+        for pid, (seq, move) in moves.items():
+            player = self.players[pid]
+            player["x"] = apply_move(player["x"], move)
+            player["ack"] = seq
+
+        if self.ball_x is None:
+            if self.drops_left <= 0:
+                return events
+            self.wait -= 1
+            if self.wait <= 0:
+                margin = self.table.spawn_margin[self.level]
+                self.ball_x = self.rng.randint(margin, WIDTH - margin)
+                self.ball_frames = 0
+                self.drops_left -= 1
+                events.append({"event": "spawn", "x": self.ball_x})
+            return events
+
+        self.ball_frames += 1
+        ball_y = self.ball_y
+        catchers = []
+        if ball_y >= PLAYER_TOP_Y - CATCH_REACH:
+            catchers = [
+                pid for pid, p in self.players.items()
+                if p["x"] - PLAYER_HALF_WIDTH <= self.ball_x <= p["x"] + PLAYER_HALF_WIDTH
+            ]
+
+        if catchers:
+            # Nearest player takes the catch; ties go to whoever joined first.
+            winner = min(catchers, key=lambda pid: abs(self.players[pid]["x"] - self.ball_x))
+            table = self.table
+            if self.level + 1 >= table.rows:
+                table.extend(self.level + 1)
+            self.players[winner]["score"] += table.points[self.level]
+            events.append({"event": "hit", "player": winner, "level": self.level})
+            self.level += 1
+            self.speed = table.speed[self.level]
+            self._end_drop()
+        elif ball_y > GROUND_Y:
+            events.append({"event": "miss"})
+            self._end_drop()
+        return events
+
+    def _end_drop(self):
+        self.ball_x = None
+        self.ball_frames = 0
+        self.wait = self.intermission
+
+    def snapshot(self):
+        ball = None if self.ball_x is None else [self.ball_x, self.ball_y]
+        return {
+            "type": "state",
+            "tick": self.tick,
+            "level": self.level,
+            "speed": round(self.speed, 2),
+            "ball": ball,
+            "players": self.players,
+        }
+
+
+class _Connection:
+    def __init__(self, player_id, name, reader, writer):
+        self.player_id = player_id
+        self.name = name
+        self.reader = reader
+        self.writer = writer
+        self.inputs = collections.deque()
+        self.last_seq = 0
+        self.connected = True
+
+    def send(self, data, limit=256 * 1024):
+        """Queue bytes without waiting; a client too slow to drain its buffer is dropped."""
+        if not self.connected:
+            return
+        transport = self.writer.transport
+        if transport.is_closing() or transport.get_write_buffer_size() > limit:
+            self.close()
+            return
+        self.writer.write(data)
+
+    def close(self):
+        if self.connected:
+            self.connected = False
+            self.writer.close()
+
+
+class VersusServer:
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, players_per_match=2,
+                 tick_rate=TICK_RATE, drops=20, seed=None, difficulty="normal"):
+        self.host = host
+        self.port = port
+        self.players_per_match = players_per_match
+        self.tick_rate = tick_rate
+        self.drops = drops
+        self.seed = seed
+        self.difficulty = difficulty
+        self.level_set = levels.load(width=WIDTH)
+        # Reject an unknown difficulty now rather than when the first match starts
+        self.level_set.table(difficulty)
+
+        self._server = None
+        self._lobby = []
+        self._player_ids = itertools.count(1)
+        self._match_ids = itertools.count(1)
+        self.matches = {}
+        self.results = []
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self.matches.values()):
+            task.cancel()
+
+    async def _handle_client(self, reader, writer):
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+        except (ValueError, ConnectionError, asyncio.LimitOverrunError):
+            hello = None
+        if not isinstance(hello, dict) or hello.get("type") != "hello":
+            writer.close()
+            return
+
+        conn = _Connection(next(self._player_ids), str(hello.get("name", "player"))[:20], reader, writer)
+        self._lobby.append(conn)
+        if len(self._lobby) >= self.players_per_match:
+            players = self._lobby[:self.players_per_match]
+            del self._lobby[:self.players_per_match]
+            match_id = next(self._match_ids)
+            seed = None if self.seed is None else self.seed + match_id
+            self.matches[match_id] = asyncio.create_task(self._run_match(match_id, players, seed))
+
+        await self._read_inputs(conn)
+
+    async def _read_inputs(self, conn):
+        """Queue batched inputs in sequence order; the match loop applies one per tick."""
+        try:
+            async for line in conn.reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(message, dict) or message.get("type") != "input":
+                    continue
+                inputs = message.get("inputs")
+                if not isinstance(inputs, list) or not all(map(valid_input, inputs)):
+                    # Anything else is a broken or hostile client
+                    break
+                for seq, move in inputs:
+                    if seq <= conn.last_seq or len(conn.inputs) >= MAX_QUEUED_INPUTS:
+                        continue
+                    conn.last_seq = seq
+                    conn.inputs.append((seq, move))
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            if conn in self._lobby:
+                self._lobby.remove(conn)
+            conn.close()
+
+    async def _run_match(self, match_id, players, seed):
+        match = VersusMatch(match_id, [c.player_id for c in players], seed=seed, drops=self.drops,
+                            difficulty=self.difficulty, level_set=self.level_set)
+        for conn in players:
+            conn.send(encode({
+                "type": "welcome",
+                "match": match_id,
+                "player": conn.player_id,
+                "tick_rate": self.tick_rate,
+                "players": {c.player_id: c.name for c in players},
+            }))
+
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        try:
+            while not match.finished and any(c.connected for c in players):
+                moves = {c.player_id: c.inputs.popleft() for c in players if c.inputs}
+                events = match.step(moves)
+                if events or match.tick % SNAPSHOT_INTERVAL == 0:
+                    message = match.snapshot()
+                    message["events"] = events
+                    data = encode(message)
+                    for conn in players:
+                        conn.send(data)
+
+                next_tick += interval
+                delay = next_tick - loop.time()
+                if delay < -interval * 5:
+                    # Too far behind to catch up; resync rather than burst ticks.
+                    next_tick = loop.time()
+                await asyncio.sleep(max(0.0, delay))
+
+            scores = {pid: p["score"] for pid, p in match.players.items()}
+            self.results.append((match_id, scores))
+            data = encode({"type": "over", "scores": scores})
+            for conn in players:
+                conn.send(data)
+                conn.close()
+        finally:
+            self.matches.pop(match_id, None)
+
+
+async def run_demo(matches, players_per_match, drops, tick_rate):
+    """Run a server and bot clients over loopback and report the results."""
+    from versus_client import VersusClient, chase_ball
+
+    server = VersusServer(port=0, players_per_match=players_per_match,
+                          tick_rate=tick_rate, drops=drops, seed=1)
+    await server.start()
+    clients = [VersusClient(f"bot{i}") for i in range(matches * players_per_match)]
+    for client in clients:
+        await client.connect("127.0.0.1", server.port)
+    await asyncio.gather(*(client.run(chase_ball) for client in clients))
+    await server.close()
+
+    for match_id, scores in sorted(server.results):
+        print(f"Match {match_id}: " + ", ".join(f"player {pid} = {score}" for pid, score in scores.items()))
+    corrections = sum(c.corrections for c in clients)
+    inputs = sum(c.seq for c in clients)
+    print(f"Prediction corrections: {corrections} of {inputs} inputs")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ball Catch versus server")
+    parser.add_argument("mode", choices=["serve", "demo"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--players", type=int, default=2, help="players per match")
+    parser.add_argument("--drops", type=int, default=20, help="balls dropped per match")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    parser.add_argument("--difficulty", choices=levels.DIFFICULTIES, default="normal",
+                        help="progression from config/levels.json")
+    parser.add_argument("--matches", type=int, default=4, help="concurrent matches (demo only)")
+    args = parser.parse_args(argv)
+
+    if args.mode == "serve":
+        server = VersusServer(args.host, args.port, args.players, args.tick_rate, args.drops,
+                              difficulty=args.difficulty)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+    else:
+        asyncio.run(run_demo(args.matches, args.players, args.drops, args.tick_rate))
+
+
+if __name__ == "__main__":
+    main()
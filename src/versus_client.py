@@ -0,0 +1,194 @@
+"""
+Versus Client - predicted movement on top of the authoritative versus server
+
+The client applies its own inputs immediately so movement feels instant, keeps
+every input the server has not acknowledged yet, and when a server state
+arrives it snaps to the server position and replays the unacknowledged inputs.
+
+Usage: python src/versus_client.py [--host 127.0.0.1] [--port 8766] [--bot]
+"""
+
+import argparse
+import asyncio
+import json
+
+from simulation import GROUND_Y, HEIGHT, PLAYER_HALF_WIDTH, PLAYER_TOP_Y, WIDTH, constant
+from versus import DEFAULT_PORT, TICK_RATE, apply_move, encode
+
+
+INPUT_BATCH = 2
+
+
+def chase_ball(client):
+    """Bot input: walk towards the ball, or back to the middle when there is none."""
+    ball = client.state.get("ball")
+    target = ball[0] if ball else 400
+    if client.predicted_x < target - 4:
+        return 1
+    if client.predicted_x > target + 4:
+        return -1
+    return 0
+
+
+class VersusClient:
+    def __init__(self, name="player"):
+        self.name = name
+        self.reader = None
+        self.writer = None
+
+        self.player_id = None
+        self.match_id = None
+        self.tick_rate = TICK_RATE
+        self.state = {}
+        self.scores = None
+
+        self.seq = 0
+        self.pending = []
+        self.outbox = []
+        self.predicted_x = None
+        self.corrections = 0
+
+    async def connect(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(encode({"type": "hello", "name": self.name}))
+        await self.writer.drain()
+
+    async def run(self, input_fn, on_frame=None):
+        """Play until the match ends, sampling input_fn(self) once per tick."""
+        receiver = asyncio.create_task(self._receive())
+        try:
+            while self.player_id is None and not receiver.done():
+                await asyncio.sleep(0.01)
+
+            loop = asyncio.get_running_loop()
+            interval = 1.0 / self.tick_rate
+            next_tick = loop.time()
+            while not receiver.done():
+                # No input until the first state gives us a position to predict from
+                if self.predicted_x is not None:
+                    self._predict(input_fn(self))
+                if len(self.outbox) >= INPUT_BATCH:
+                    self._flush_inputs()
+                if on_frame is not None:
+                    on_frame(self)
+
+                next_tick += interval
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+        finally:
+            receiver.cancel()
+            self.writer.close()
+        return self.scores
+
+    def _predict(self, move):
+        if self.predicted_x is None:
+            return
+        self.seq += 1
+        self.predicted_x = apply_move(self.predicted_x, move)
+        self.pending.append((self.seq, move))
+        self.outbox.append([self.seq, move])
+
+    def _flush_inputs(self):
+        try:
+            self.writer.write(encode({"type": "input", "inputs": self.outbox}))
+        except ConnectionError:
+            pass
+        self.outbox = []
+
+    def _reconcile(self, server_player):
+        ack = server_player["ack"]
+        self.pending = [(seq, move) for seq, move in self.pending if seq > ack]
+        x = server_player["x"]
+        for _, move in self.pending:
+            x = apply_move(x, move)
+        if self.predicted_x is not None and x != self.predicted_x:
+            self.corrections += 1
+        self.predicted_x = x
+
+    async def _receive(self):
+        async for line in self.reader:
+            message = json.loads(line)
+            kind = message.get("type")
+            if kind == "welcome":
+                self.player_id = str(message["player"])
+                self.match_id = message["match"]
+                self.tick_rate = message["tick_rate"]
+            elif kind == "state":
+                self.state = message
+                me = message["players"].get(self.player_id)
+                if me is not None:
+                    self._reconcile(me)
+            elif kind == "over":
+                self.scores = message["scores"]
+                return
+
+
+class VersusView:
+    """Minimal graphics.py renderer; the window is the only thing it needs."""
+
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        from graphics import GraphWin, Point, Rectangle, Circle, Text
+
+        self._Point = Point
+        self._Rectangle = Rectangle
+        self._Circle = Circle
+        self.window = GraphWin("Ball Catch Versus", width, height, autoflush=False)
+        self.window.setBackground(constant.BACKGROUND_COLOR)
+        ground = Rectangle(Point(0, GROUND_Y), Point(width, height))
+        ground.setFill(constant.GROUND_COLOR)
+        ground.draw(self.window)
+        self.status = Text(Point(width // 2, 30), "Waiting for opponent...")
+        self.status.setSize(16)
+        self.status.setStyle("bold")
+        self.status.draw(self.window)
+        self._shapes = []
+
+    def read_input(self, client):
+        key = self.window.checkKey()
+        if key == "Left":
+            return -1
+        if key == "Right":
+            return 1
+        return 0
+
+    def draw(self, client):
+        for shape in self._shapes:
+            shape.undraw()
+        self._shapes = []
+        players = client.state.get("players", {})
+        for pid, player in players.items():
+            x = client.predicted_x if pid == client.player_id else player["x"]
+            body = self._Rectangle(self._Point(x - PLAYER_HALF_WIDTH, PLAYER_TOP_Y),
+                                   self._Point(x + PLAYER_HALF_WIDTH, GROUND_Y))
+            body.setFill("#2563eb" if pid == client.player_id else "#ef4444")
+            body.draw(self.window)
+            self._shapes.append(body)
+        ball = client.state.get("ball")
+        if ball:
+            circle = self._Circle(self._Point(ball[0], ball[1]), constant.BALL_RADIUS)
+            circle.setFill(constant.BALL_COLOR)
+            circle.draw(self.window)
+            self._shapes.append(circle)
+        scores = "  ".join(f"P{pid}: {p['score']}" for pid, p in players.items())
+        self.status.setText(f"Level {client.state.get('level', 1)}   {scores}")
+        self.window.update()
+
+
+async def play(host, port, name, bot):
+    client = VersusClient(name)
+    await client.connect(host, port)
+    if bot:
+        scores = await client.run(chase_ball)
+    else:
+        view = VersusView()
+        scores = await client.run(view.read_input, view.draw)
+    print(f"Final scores: {scores}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ball Catch versus client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--name", default="player")
+    parser.add_argument("--bot", action="store_true", help="play with a simple bot instead of the keyboard")
+    args = parser.parse_args()
+    asyncio.run(play(args.host, args.port, args.name, args.bot))
@@ -1,7 +1,6 @@
 # Functions for loading images, sounds, etc.
-from graphics import *
+from assets import shared_assets
 
 def load_image(path, x, y):
-    """Load an image and place it at x, y"""
-    image = Image(Point(x, y), path)
-    return image
+    """Load an image and place it at x, y (decoded once, then served from the asset cache)"""
+    return shared_assets.image(path, x, y)